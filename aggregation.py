@@ -0,0 +1,221 @@
+import numpy as np
+
+# Fixed 1-unit histogram bins per stat: [low, high) range, values outside are
+# counted in the edge bins
+YARD_RANGE = (-100, 1000)
+COUNT_RANGE = (0, 50)
+SCORE_RANGE = (0, 150)
+
+def _sparse(hist:np.ndarray) -> tuple:
+    # Non-empty bins of a histogram, indices and counts in the smallest
+    # integer types that hold them
+    index = np.flatnonzero(hist)
+    counts = hist.ravel()[index]
+    return (hist.shape, index.astype(np.min_scalar_type(max(hist.size-1, 0))),
+            counts.astype(np.min_scalar_type(counts.max() if len(counts) else 0)))
+
+def _dense(shape:tuple, index:np.ndarray, counts:np.ndarray) -> np.ndarray:
+    hist = np.zeros(shape, dtype=np.int64)
+    hist.ravel()[index] = counts
+    return hist
+
+class SimSummary:
+    """Streaming, mergeable summary of simulated games.
+
+    Keeps running moments (count, mean, variance via Chan's parallel update),
+    exact min/max and fixed 1-unit bin histograms for every (player, stat), plus
+    moments and a joint (home, away) histogram of the final scores. Memory
+    depends only on the number of players and bins, never on the number of
+    games, and summaries built by different workers combine with merge().
+
+    Quantiles are read from the histograms. They are exact for integer stats
+    (scores, touchdowns, receptions, interceptions) and within half a yard for
+    yardage stats, which are interpolated within their 1-yard bin.
+
+    Typical usage example:
+
+        summary = SimSummary(players, STAT_NAMES)
+        summary.update(home_scores, away_scores, stats)
+        summary.merge(other_summary)
+        summary.quantile("pass_yards", "Jalen Hurts", [0.1, 0.5, 0.9])
+
+    Attributes:
+        players: Player names along the player axis of the stat arrays
+        stat_names: Stat names along the stat axis of the stat arrays
+        n: Number of games summarized
+    """
+
+    def __init__(self, players:list[str], stat_names:list[str]):
+        self.players = list(players)
+        self.stat_names = list(stat_names)
+        self.n = 0
+        shape = (len(self.players), len(self.stat_names))
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._min = np.full(shape, np.inf)
+        self._max = np.full(shape, -np.inf)
+        self._ranges = [YARD_RANGE if "yards" in stat else COUNT_RANGE for stat in self.stat_names]
+        self._hists = [np.zeros((len(self.players), high-low), dtype=np.int64) for low, high in self._ranges]
+        # Home/away score moments ([home, away, spread]) and joint histogram
+        self._score_mean = np.zeros(3)
+        self._score_m2 = np.zeros(3)
+        self._score_hist = np.zeros((SCORE_RANGE[1]-SCORE_RANGE[0],)*2, dtype=np.int64)
+
+    def __getstate__(self):
+        # Summaries are sent between processes once per batch, so histograms
+        # are pickled as their non-empty bins (a 100-game batch's dense
+        # histograms alone take ~700 KB, far more than its raw arrays)
+        state = self.__dict__.copy()
+        state["_hists"] = [_sparse(hist) for hist in self._hists]
+        state["_score_hist"] = _sparse(self._score_hist)
+        return state
+
+    def __setstate__(self, state:dict):
+        state["_hists"] = [_dense(*hist) for hist in state["_hists"]]
+        state["_score_hist"] = _dense(*state["_score_hist"])
+        self.__dict__.update(state)
+
+    @staticmethod
+    def _combine(n_a:int, mean_a:np.ndarray, m2_a:np.ndarray, n_b:int, mean_b:np.ndarray,
+                 m2_b:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Chan et al. pairwise update of mean and sum of squared deviations
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        return mean_a + delta*n_b/n, m2_a + m2_b + delta**2*n_a*n_b/n
+
+    def update(self, home_scores:np.ndarray, away_scores:np.ndarray, stats:np.ndarray):
+        """Add a batch of games.
+
+        Args:
+            home_scores: (games,) array of home scores
+            away_scores: (games,) array of away scores
+            stats: (games, players, stats) array of per-game player stats
+        """
+        n = len(home_scores)
+        if n == 0:
+            return
+        stats = np.asarray(stats, dtype=float)
+        self._mean, self._m2 = self._combine(self.n, self._mean, self._m2, n, stats.mean(axis=0),
+                                             ((stats - stats.mean(axis=0))**2).sum(axis=0))
+        self._min = np.minimum(self._min, stats.min(axis=0))
+        self._max = np.maximum(self._max, stats.max(axis=0))
+        players = np.arange(len(self.players))
+        for s, (low, high) in enumerate(self._ranges):
+            bins = np.clip(np.floor(stats[:, :, s]).astype(int) - low, 0, high-low-1)
+            flat = (players*(high-low) + bins).ravel()
+            self._hists[s] += np.bincount(flat, minlength=self._hists[s].size).reshape(self._hists[s].shape)
+        scores = np.stack([home_scores, away_scores, np.subtract(home_scores, away_scores)], axis=1).astype(float)
+        self._score_mean, self._score_m2 = self._combine(self.n, self._score_mean, self._score_m2, n,
+                                                         scores.mean(axis=0),
+                                                         ((scores - scores.mean(axis=0))**2).sum(axis=0))
+        size = SCORE_RANGE[1]-SCORE_RANGE[0]
+        home = np.clip(np.asarray(home_scores, dtype=int) - SCORE_RANGE[0], 0, size-1)
+        away = np.clip(np.asarray(away_scores, dtype=int) - SCORE_RANGE[0], 0, size-1)
+        self._score_hist += np.bincount(home*size + away, minlength=size*size).reshape(size, size)
+        self.n += n
+
+    def merge(self, other:"SimSummary") -> "SimSummary":
+        # Combine another summary of the same matchup into this one
+        if other.players != self.players or other.stat_names != self.stat_names:
+            raise ValueError("Can only merge summaries with the same players and stats")
+        if other.n == 0:
+            return self
+        self._mean, self._m2 = self._combine(self.n, self._mean, self._m2, other.n, other._mean, other._m2)
+        self._score_mean, self._score_m2 = self._combine(self.n, self._score_mean, self._score_m2,
+                                                         other.n, other._score_mean, other._score_m2)
+        self._min = np.minimum(self._min, other._min)
+        self._max = np.maximum(self._max, other._max)
+        for hist, other_hist in zip(self._hists, other._hists):
+            hist += other_hist
+        self._score_hist += other._score_hist
+        self.n += other.n
+        return self
+
+    def __index(self, stat:str, player:str) -> tuple[int, int]:
+        return self.players.index(player), self.stat_names.index(stat)
+
+    def mean(self, stat:str, player:str) -> float:
+        return self._mean[self.__index(stat, player)]
+
+    def var(self, stat:str, player:str) -> float:
+        # Sample variance (ddof=1)
+        return self._m2[self.__index(stat, player)] / max(self.n-1, 1)
+
+    def std(self, stat:str, player:str) -> float:
+        return np.sqrt(self.var(stat, player))
+
+    def has_data(self, stat:str, player:str) -> bool:
+        # Whether the player recorded a non-zero value of stat in any game
+        index = self.__index(stat, player)
+        return self._min[index] != 0 or self._max[index] != 0
+
+    def histogram(self, stat:str, player:str) -> tuple[np.ndarray, np.ndarray]:
+        """Histogram of a player's per-game values for one stat.
+
+        Returns:
+            Bin lower edges and counts for the non-empty span of the histogram.
+        """
+        p, s = self.__index(stat, player)
+        counts = self._hists[s][p]
+        nonzero = np.flatnonzero(counts)
+        if len(nonzero) == 0:
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+        span = slice(nonzero[0], nonzero[-1]+1)
+        return np.arange(*self._ranges[s])[span], counts[span]
+
+    def quantile(self, stat:str, player:str, q:float|list[float]) -> np.ndarray:
+        p, s = self.__index(stat, player)
+        low, high = self._ranges[s]
+        counts = self._hists[s][p]
+        cdf = np.cumsum(counts) / max(self.n, 1)
+        q = np.atleast_1d(q)
+        bins = np.minimum(np.searchsorted(cdf, q, side="left"), len(cdf)-1)
+        values = low + bins.astype(float)
+        if "yards" in stat:
+            # Interpolate within the 1-yard bin
+            below = np.where(bins > 0, cdf[bins-1], 0)
+            values += np.clip((q - below) / np.maximum(cdf[bins] - below, 1e-12), 0, 1)
+        return np.clip(values, self._min[p, s], self._max[p, s])
+
+    def score_mean(self) -> tuple[float, float]:
+        return self._score_mean[0], self._score_mean[1]
+
+    def spread(self) -> tuple[float, float]:
+        # Mean home-minus-away margin and its standard error
+        se = np.sqrt(self._score_m2[2] / max(self.n-1, 1) / max(self.n, 1))
+        return self._score_mean[2], se
+
+    def spread_quantile(self, q:float|list[float]) -> np.ndarray:
+        # Quantiles of the home-minus-away margin (exact, margins are integers)
+        size = SCORE_RANGE[1]-SCORE_RANGE[0]
+        home, away = np.indices(self._score_hist.shape)
+        counts = np.bincount((home - away + size-1).ravel(), weights=self._score_hist.ravel(), minlength=2*size-1)
+        cdf = np.cumsum(counts) / max(self.n, 1)
+        bins = np.minimum(np.searchsorted(cdf, np.atleast_1d(q) - 1e-12, side="left"), len(cdf)-1)
+        return (bins - (size-1)).astype(float)
+
+    def win_prob(self) -> tuple[float, float, float]:
+        # Probability of a home win, tie and away win
+        home, away = np.indices(self._score_hist.shape)
+        total = max(self.n, 1)
+        return (self._score_hist[home > away].sum()/total, self._score_hist[home == away].sum()/total,
+                self._score_hist[home < away].sum()/total)
+
+    def standard_error(self, target:str|tuple[str, str]) -> float:
+        """Standard error of one of the summary's estimates.
+
+        Args:
+            target: "spread" (mean home margin), "win_prob" (home win
+                probability) or a (stat, player) tuple (the player's mean)
+        """
+        if target == "spread":
+            return self.spread()[1]
+        if target == "win_prob":
+            p = self.win_prob()[0]
+            return np.sqrt(p*(1-p) / max(self.n, 1))
+        stat, player = target
+        return self.std(stat, player) / np.sqrt(max(self.n, 1))
+
+    def score_histogram(self) -> np.ndarray:
+        # Joint counts of final scores, indexed [home score, away score]
+        return self._score_hist
@@ -5,17 +5,21 @@ import pandas as pd
 import numpy as np
 from monte_carlo import Monte_Carlo_Sim
 from helper import get_player_stats
+from results_store import ResultsStore, list_results
+from result_cache import ResultCache
+from benchmark import load_benchmark, quick_benchmark, estimate_time
+from jobs import SimJob
 from multiprocessing import cpu_count
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
 import json
 
 pd.set_option("display.float_format", "{:.2f}".format)
 
 # Need to make reactive in order to update after users run simulations
-def get_results(dir_path="./results", suffix="stats.csv"):
-    file_names = [f for f in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path,f))]
-    game_results = [f.replace(suffix,"") for f in file_names if suffix in f]
-    return game_results
+def get_results(dir_path="./results"):
+    return list_results(dir_path)
 
 def get_saved_scores(dir_path="./results/"):
     scores_file = dir_path + "scores.json"
@@ -23,9 +27,22 @@ def get_saved_scores(dir_path="./results/"):
     return game_scores
 
 sim = Monte_Carlo_Sim()
+# Seeded runs are cached, so repeating a matchup only simulates games not yet run
+cache = ResultCache()
+# Measured throughput on this host (run benchmark.py for core scaling numbers)
+benchmark = load_benchmark() or quick_benchmark(sim)
+# Simulations run as background jobs, up to MAX_JOBS at once (later ones queue),
+# on one worker pool of POOL_CPUS processes shared by every session. Each job
+# keeps only a few batches queued on the pool (see Monte_Carlo_Sim.iter_sim()),
+# so the batches of concurrent jobs interleave and a long job can't hold up
+# everyone else's
+MAX_JOBS = 4
+POOL_CPUS = cpu_count()
+executor = ThreadPoolExecutor(max_workers=MAX_JOBS)
+# Seconds between progress and partial score updates of a running job
+PROGRESS_INTERVAL = 0.5
 
-test_df = pd.read_csv("./results/PHIvDALstats.csv", header=[0,1], index_col=0)
-players = pd.unique(test_df.columns.get_level_values(1))
+players = ResultsStore("./results/PHIvDAL").players if "PHIvDAL" in get_results() else []
 
 team_names = ["Arizona Cardinals","Atlanta Falcons","Baltimore Ravens","Buffalo Bills",
               "Carolina Panthers","Chicago Bears","Cincinnati Bengals","Cleveland Browns",
@@ -66,12 +83,14 @@ app_ui = ui.page_fluid(
                     Home and Away teams are selected from their respective dropdown menus (NOTE: Currently there is no homefield advantage in the simulation).
                     Users can also specify how many times the matchup should be simulated and how many CPU cores to allocate to the simulation.
                     Additionally, if one wants to analyze the player stats for a given matchup, the "Export Stats" button should be selected.
-                    Once ready, press Run and the simulation will start running, returning the average scores of each team when complete.
+                    Once ready, press Run and the simulation will start running in the background, updating the average scores of each team as games complete.
+                    A running simulation can be stopped with Cancel.
+                    Runs are reproducible for a given seed and are cached in the ./cache folder, so rerunning a matchup (or asking for more games of it) only simulates games that have not been run yet.
 
                     ## Stat Summary
 
                     Because this simulation models player-level actions, the resulting player stats from each matchup can be tabulated and returned.
-                    These are exported in a [Home]v[Away]stats.csv file to the ./results folder.
+                    These are exported to a [Home]v[Away] results store (columnar .npy files) in the ./results folder.
                     The Stat Summary tab reads any stats files currently in the ./results folder and displays the average stats for each player.
 
                     ## Visualizations
@@ -97,10 +116,12 @@ app_ui = ui.page_fluid(
                 ui.card(
                     ui.card_header(""),
                     ui.input_numeric("n", "Number of Games:", 1000, min=1, max=100000),
+                    ui.input_numeric("seed", "Seed:", 0, min=0),
                     ui.output_text("time_estimate"),
                     ui.input_checkbox("stats","Export Stats"),
-                    ui.input_slider("cpus", "CPUs to Use:", min=1, max=cpu_count(), value=1),
-                    ui.input_action_button("run", "Run")
+                    ui.input_task_button("run", "Run"),
+                    ui.input_action_button("cancel", "Cancel"),
+                    ui.output_text("sim_status")
                 ),
                 ui.card(
                     ui.card_header("Away"),
@@ -192,22 +213,74 @@ app_ui = ui.page_fluid(
 def server(input, output, session):
     home_scores = reactive.value([0])
     away_scores = reactive.value([0])
+    current_job = reactive.value(None)
+
+    @ui.bind_task_button(button_id="run")
+    @reactive.extended_task
+    async def sim_task(job:SimJob) -> SimJob:
+        await asyncio.get_running_loop().run_in_executor(executor, job.run)
+        return job
 
     @reactive.effect()
     @reactive.event(input.run)
     def get_scores():
         home, away = team_dict[input.home_team()], team_dict[input.away_team()]
+        export_path = "./results/" + home + "v" + away if input.stats() else None
+        job = SimJob(sim, home, away, input.n(), POOL_CPUS, seed=input.seed(), cache=cache,
+                     export_path=export_path)
+        current_job.set(job)
+        sim_task.invoke(job)
+
+    @reactive.effect()
+    @reactive.event(input.cancel)
+    def cancel_sim():
+        job = current_job.get()
+        if job is not None:
+            job.cancel()
+        sim_task.cancel()
+
+    # Stream the scores of completed games while a job runs
+    @reactive.effect()
+    def stream_scores():
+        job = current_job.get()
+        if job is None:
+            return
+        home_results, away_results = job.partial_scores()
+        if len(home_results):
+            home_scores.set(home_results.tolist())
+            away_scores.set(away_results.tolist())
+        if not job.done() and not job.cancelled():
+            reactive.invalidate_later(PROGRESS_INTERVAL)
+
+    @reactive.effect()
+    def save_scores():
+        job = sim_task.result()
+        if job.cancelled():
+            return
+        home_results, away_results = job.partial_scores()
         game_results = get_saved_scores()
-        with ui.Progress(min=1, max=input.n()) as p:
-            p.set(message="Simulating Games")
-            home_results, away_results = sim.parallel_sim(home, away, input.n(), cpu_count=input.cpus(), progress=p)
-            home_scores.set(list(home_results))
-            away_scores.set(list(away_results))
-            game_results[home+"v"+away] = [home_results, away_results]
-            with open("./results/scores.json", "w") as f:
-                json.dump(game_results, f)
-            if input.stats():
-                sim.export_stats(home, away)
+        game_results[job.home+"v"+job.away] = [home_results.tolist(), away_results.tolist()]
+        with open("./results/scores.json", "w") as f:
+            json.dump(game_results, f)
+
+    @render.text
+    def sim_status():
+        job = current_job.get()
+        if job is None:
+            return ""
+        completed, n = job.progress()
+        if job.cancelled():
+            if not job.done():
+                # Stopping after the batches already on the worker pool
+                reactive.invalidate_later(PROGRESS_INTERVAL)
+            return "Cancelled after {:,} of {:,} games".format(completed, n)
+        if not job.started():
+            reactive.invalidate_later(PROGRESS_INTERVAL)
+            return "Queued, waiting for another simulation to finish"
+        if not job.done():
+            reactive.invalidate_later(PROGRESS_INTERVAL)
+            return "Simulated {:,} of {:,} games".format(completed, n)
+        return "Simulated {:,} games".format(completed)
 
     @render.text
     def home_score():
@@ -219,8 +292,8 @@ def server(input, output, session):
 
     @render.text
     def time_estimate():
-        #Empirically derived time estimate
-        time = (input.n()*(0.161-0.05646*np.log(input.cpus()))+5.1)/60
+        # Derived from this host's benchmark results
+        time = estimate_time(benchmark, input.n(), POOL_CPUS)/60
         return "Estimated Simulation Time: {:.2f} minutes".format(time)
 
     @render.image #type: ignore
@@ -238,7 +311,7 @@ def server(input, output, session):
     #Update available players when game, stat data changes
     @reactive.effect
     def _():
-        players = list(pd.unique(get_game()[input.stat()].columns))
+        players = get_game().players_with(input.stat())
         ui.update_selectize("players", choices=players, selected=players[0])
  
     @reactive.effect
@@ -254,14 +327,13 @@ def server(input, output, session):
     @reactive.calc
     def get_game():
         game = input.game()
-        game_str = "./results/" + game + "stats.csv"
-        return pd.read_csv(game_str, header=[0,1], index_col=0)
+        return ResultsStore("./results/" + game)
 
     @render_plotly
     def stat_hist():
-        data = get_game()[input.stat()]
-        average = np.mean(data[input.players()])
-        fig = px.histogram(data, x=input.players())
+        data = get_game().column(input.stat(), input.players())
+        average = np.mean(data)
+        fig = px.histogram(x=data, labels={"x":input.players()})
         fig.add_vline(x=average, line_color="red",
                       annotation_text="Average: {:.1f} yards".format(average),
                       annotation_position="top right")
@@ -0,0 +1,55 @@
+import hashlib
+import os
+import pickle
+
+# Bump whenever the layout of the compiled model state changes
+ARTIFACT_VERSION = 3
+# Every file the compiled model is built from
+SOURCE_FILES = ["./data/run_data.csv", "./data/field_goals.csv", "./data/punts.csv",
+                "./data/pass_data.csv", "./data/teams.csv", "./data/playcall_profiles.csv",
+                "./data/target_pct.csv", "./data/rush_pct.csv", "./data/player_ids.csv",
+                "./data/params.json"]
+
+def source_hash(paths:list[str]=SOURCE_FILES) -> str:
+    """Content hash of the model's source files.
+
+    Missing files hash as absent, so creating one (e.g. params.json after a
+    fit) also changes the hash.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        else:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+def save_artifact(path:str, state:dict, digest:str):
+    # Header and state are separate pickles so a stale artifact is rejected
+    # without unpickling the (much larger) state
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version":ARTIFACT_VERSION, "source_hash":digest}, f)
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def load_artifact(path:str, digest:str) -> dict | None:
+    """Load a compiled model state saved by save_artifact().
+
+    Returns:
+        The saved state, or None if the artifact is missing, was written by a
+        different ARTIFACT_VERSION or was built from different source files.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        try:
+            header = pickle.load(f)
+            if header != {"version":ARTIFACT_VERSION, "source_hash":digest}:
+                return None
+            return pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Corrupt or written by incompatible code, rebuild
+            return None
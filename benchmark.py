@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import platform
+import time
+import tracemalloc
+from multiprocessing import cpu_count, freeze_support
+import numpy as np
+from monte_carlo import Monte_Carlo_Sim
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, peak RSS is then left out
+    resource = None
+
+BENCHMARK_VERSION = 2
+# Latest measurements on this host, read by the app's time estimate
+BENCHMARK_FILE = "./data/benchmark.json"
+# Stored reference measurements that later runs are compared against
+BASELINE_FILE = "./data/benchmark_baseline.json"
+SNAPS_PER_GAME = 124
+# Only timings are used, so any matchup will do
+HOME, AWAY = "PHI", "DAL"
+
+def bench_startup() -> dict[str, float]:
+    # Seconds until one matchup can be simulated, building the model from
+    # ./data and loading it from the artifact (teams are built on first use)
+    start = time.perf_counter()
+    Monte_Carlo_Sim(artifact=None).build_teams(HOME, AWAY)
+    build = time.perf_counter() - start
+    Monte_Carlo_Sim()
+    start = time.perf_counter()
+    Monte_Carlo_Sim().build_teams(HOME, AWAY)
+    return {"build":build, "artifact":time.perf_counter() - start}
+
+def bench_engine(sim:Monte_Carlo_Sim, engine:str, n:int) -> dict[str, float]:
+    """Single-core throughput and peak memory of one engine.
+
+    Timing and memory are measured in separate runs, since tracing
+    allocations slows the simulation down.
+    """
+    sim.simulate(HOME, AWAY, min(n, 10), engine, seed=0)
+    start = time.perf_counter()
+    sim.simulate(HOME, AWAY, n, engine, seed=0)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    sim.simulate(HOME, AWAY, n, engine, seed=1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"games":n, "seconds":seconds, "per_game":seconds/n,
+            "per_snap":seconds/(n*SNAPS_PER_GAME), "peak_mb":peak/1024**2}
+
+def bench_scaling(sim:Monte_Carlo_Sim, engine:str, n:int, cpus:list[int]) -> dict[str, dict]:
+    """Parallel throughput of n games on each core count in cpus.
+
+    Each core count gets a fresh worker pool. Starting it (sending the model
+    to every worker) is timed separately from simulating the games.
+    """
+    scaling = dict()
+    for cpu in cpus:
+        sim.close()
+        start = time.perf_counter()
+        sim.summarize_sim(HOME, AWAY, cpu, cpu, engine=engine, batch_size=1)
+        pool_start = time.perf_counter() - start
+        start = time.perf_counter()
+        sim.summarize_sim(HOME, AWAY, n, cpu, engine=engine, seed=0)
+        seconds = time.perf_counter() - start
+        scaling[str(cpu)] = {"games":n, "seconds":seconds, "games_per_sec":n/seconds,
+                             "pool_start":pool_start}
+    sim.close()
+    return scaling
+
+def peak_rss() -> dict[str, float]:
+    # Peak resident memory of this process and of its largest worker, in MB
+    if resource is None:
+        return {}
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    unit = 1 if platform.system() == "Darwin" else 1024
+    return {"max_rss_mb":resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*unit/1024**2,
+            "max_worker_rss_mb":resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss*unit/1024**2}
+
+def default_cpus(max_cpus:int) -> list[int]:
+    # Powers of two up to max_cpus, plus max_cpus itself
+    cpus = [2**i for i in range(int(np.log2(max_cpus))+1)]
+    return cpus if cpus[-1] == max_cpus else cpus + [max_cpus]
+
+def run_benchmarks(max_cpus:int|None=None, game_n:int=200, batch_n:int=5000,
+                   scaling_n:int|None=None, engines=("game", "batch")) -> dict:
+    """Measure startup, per-game/per-snap throughput, scaling and peak memory.
+
+    Args:
+        max_cpus: Largest core count for the scaling runs (default all cores)
+        game_n: Games per single-core sim_game() measurement
+        batch_n: Games per single-core sim_batch() measurement
+        scaling_n: Games per scaling run (default 100 per core of max_cpus for
+            sim_game and 25 times that for sim_batch)
+        engines: Engines to measure
+
+    Returns:
+        Dictionary of results, as written by save_benchmark().
+    """
+    max_cpus = max_cpus or cpu_count()
+    results = {"version":BENCHMARK_VERSION, "timestamp":time.time(),
+               "host":{"platform":platform.platform(), "processor":platform.processor(),
+                       "python":platform.python_version(), "cpu_count":cpu_count()},
+               "startup":bench_startup()}
+    sim = Monte_Carlo_Sim()
+    results["model_hash"] = sim.model_hash
+    results["engines"] = {engine:bench_engine(sim, engine, game_n if engine == "game" else batch_n)
+                          for engine in engines}
+    scaling_n = scaling_n or 100*max_cpus
+    results["scaling"] = {engine:bench_scaling(sim, engine, scaling_n if engine == "game" else 25*scaling_n,
+                                               default_cpus(max_cpus))
+                          for engine in engines}
+    results["memory"] = peak_rss()
+    return results
+
+def save_benchmark(results:dict, path:str=BENCHMARK_FILE):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+def load_benchmark(path:str=BENCHMARK_FILE) -> dict | None:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        results = json.load(f)
+    return results if results.get("version") == BENCHMARK_VERSION else None
+
+def compare(results:dict, baseline:dict, tolerance:float=0.15) -> list[str]:
+    """Regressions of results against a baseline.
+
+    Args:
+        results: Current results from run_benchmarks()
+        baseline: Baseline results from run_benchmarks()
+        tolerance: Allowed relative slowdown (or memory growth) before a
+            measurement counts as a regression
+
+    Returns:
+        One message per regressed measurement (empty if there are none).
+    """
+    # (path, True if higher is better)
+    metrics = [(("startup", key), False) for key in results["startup"]]
+    for engine in results["engines"]:
+        metrics += [(("engines", engine, "per_game"), False), (("engines", engine, "peak_mb"), False)]
+        metrics += [(("scaling", engine, cpu, "games_per_sec"), True) for cpu in results["scaling"][engine]]
+    regressions = list()
+    for path, higher_is_better in metrics:
+        current, reference = results, baseline
+        try:
+            for key in path:
+                current, reference = current[key], reference[key]
+        except KeyError:
+            # Not measured in the baseline
+            continue
+        change = reference/current - 1 if higher_is_better else current/reference - 1
+        if change > tolerance:
+            regressions.append("{}: {:.4g} vs baseline {:.4g} ({:+.0%})".format(
+                ".".join(path), current, reference, change))
+    return regressions
+
+def quick_benchmark(sim:Monte_Carlo_Sim, n:int=20) -> dict:
+    # Single-core sim_game() throughput only, for hosts without a benchmark file
+    return {"version":BENCHMARK_VERSION, "engines":{"game":bench_engine(sim, "game", n)}}
+
+def estimate_time(results:dict, n:int, cpus:int, engine:str="game") -> float:
+    """Estimated seconds to simulate n games on cpus cores.
+
+    Games per second are interpolated between the measured core counts (and
+    scaled linearly per core beyond them), plus the time to start the worker
+    pool. Without scaling measurements the single-core rate is assumed to
+    scale linearly.
+    """
+    scaling = results.get("scaling", {}).get(engine)
+    if not scaling:
+        return n*results["engines"][engine]["per_game"]/cpus
+    measured = sorted((int(cpu), values) for cpu, values in scaling.items())
+    counts = [cpu for cpu, _ in measured]
+    rates = [values["games_per_sec"] for _, values in measured]
+    starts = [values["pool_start"] for _, values in measured]
+    if cpus > counts[-1]:
+        rate = rates[-1]*cpus/counts[-1]
+    else:
+        rate = np.interp(cpus, counts, rates)
+    return np.interp(cpus, counts, starts) + n/rate
+
+def print_results(results:dict):
+    print("Startup: {:.2f}s (build), {:.2f}s (artifact)".format(results["startup"]["build"],
+                                                              results["startup"]["artifact"]))
+    for engine, measured in results["engines"].items():
+        print("{}: {:.3f} ms/game, {:.1f} us/snap, peak {:.1f} MB".format(
+            engine, measured["per_game"]*1e3, measured["per_snap"]*1e6, measured["peak_mb"]))
+        for cpu, scaled in results["scaling"][engine].items():
+            print("    {:>3} cores: {:,.0f} games/s (pool start {:.2f}s)".format(
+                cpu, scaled["games_per_sec"], scaled["pool_start"]))
+    for name, value in results["memory"].items():
+        print("{}: {:.0f}".format(name, value))
+
+if __name__ == "__main__":
+    freeze_support()
+    parser = argparse.ArgumentParser(description="Benchmark the simulation engines on this host")
+    parser.add_argument("--cpus", type=int, default=None, help="largest core count to measure")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the regression baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="relative slowdown allowed before reporting a regression")
+    args = parser.parse_args()
+    results = run_benchmarks(args.cpus)
+    print_results(results)
+    save_benchmark(results)
+    baseline = load_benchmark(BASELINE_FILE)
+    if args.save_baseline or baseline is None:
+        save_benchmark(results, BASELINE_FILE)
+    else:
+        regressions = compare(results, baseline, args.tolerance)
+        print("Regressions against baseline:" if regressions else "No regressions against baseline")
+        for regression in regressions:
+            print("    " + regression)
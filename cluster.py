@@ -0,0 +1,283 @@
+import argparse
+import itertools
+import os
+import queue
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import Future, as_completed
+from multiprocessing import Process, freeze_support
+from multiprocessing.managers import BaseManager
+import monte_carlo
+from monte_carlo import Monte_Carlo_Sim
+
+DEFAULT_ADDRESS = ("127.0.0.1", 50000)
+# Shared secret of the coordinator and its workers. Shards are pickled, so use
+# your own key (--authkey) whenever the port is reachable from other hosts.
+DEFAULT_AUTHKEY = b"monte-carlo-nfl"
+# Seconds a worker may hold a shard before it is assumed lost and retried
+SHARD_TIMEOUT = 120
+# Retries of a failed or lost shard before its job fails
+MAX_RETRIES = 3
+
+class ShardResult:
+    # Result of one shard, with the get() of multiprocessing's AsyncResult
+
+    def __init__(self, future:Future):
+        self.future = future
+
+    def get(self, timeout:float|None=None):
+        return self.future.result(timeout)
+
+class _ShardQueue(queue.Queue):
+    # Shard queue that hands workers None once the coordinator is closed
+    closed = False
+
+    def get(self, block=True, timeout=None):
+        if self.closed:
+            return None
+        return super().get(block, timeout)
+
+class _Shard:
+    __slots__ = ("func", "task", "results_hash", "future", "attempts", "deadline")
+
+    def __init__(self, func, task, results_hash:str):
+        self.func = func
+        self.task = task
+        self.results_hash = results_hash
+        self.future = Future()
+        self.attempts = 0
+        # Set once a worker reports it started the shard
+        self.deadline = None
+
+class Coordinator:
+    """Hands simulation shards to worker processes on any number of hosts.
+
+    Shards are the same (function, task) work units Monte_Carlo_Sim sends to
+    its local worker pool, and pool() offers the same imap(), imap_unordered()
+    and apply_async() calls. Setting the Coordinator as the sim's cluster
+    therefore runs parallel_sim(), iter_matchups(), sim_season() and the rest
+    on the cluster unchanged, with the same results as a local run. Seeded
+    runs stay identical for any number of workers (see
+    monte_carlo.SEED_BLOCKS).
+
+    Every shard carries the results hash of the sim that submitted it (see
+    Monte_Carlo_Sim.results_hash), as of the start of its run (e.g. after a
+    refit()), and workers with another model, pool_size or engine version
+    reject it.
+
+    Shards travel through a multiprocessing manager queue. Workers (see
+    run_worker()) report when they start a shard. A shard that fails, or
+    whose worker goes quiet for longer than timeout, is queued again, up to
+    max_retries times, without affecting the rest of the job.
+
+    Typical usage example:
+
+        # On each worker host: python cluster.py worker --address host:50000
+        sim = Monte_Carlo_Sim()
+        sim.cluster = Coordinator(("", 50000), b"secret")
+        home_scores, away_scores = sim.parallel_sim("PHI","DAL",100000,64,seed=0)
+
+    Pass the total number of worker processes in the cluster as cpu_count, it
+    sizes the shards and how many are queued at once.
+
+    Attributes:
+        address: (host, port) the coordinator listens on
+        timeout: Seconds a started shard may run before it is retried
+        max_retries: Retries per shard before its result raises RuntimeError
+    """
+
+    def __init__(self, address:tuple[str, int]=DEFAULT_ADDRESS, authkey:bytes=DEFAULT_AUTHKEY,
+                 timeout:float=SHARD_TIMEOUT, max_retries:int=MAX_RETRIES):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._tasks = _ShardQueue()
+        self._results = queue.Queue()
+        self._shards = dict()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        # Each coordinator serves its own queues
+        manager = type("CoordinatorManager", (BaseManager,), {})
+        manager.register("tasks", callable=lambda: self._tasks)
+        manager.register("results", callable=lambda: self._results)
+        self._server = manager(address=address, authkey=authkey).get_server()
+        self.address = self._server.address
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        threading.Thread(target=self.__collect, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self, grace:float=5):
+        # Send connected workers home, give them grace seconds to disconnect
+        # (they release their queues on exit) and stop serving
+        self._closed.set()
+        self._tasks.closed = True
+        # The server's refcounts, stop_event and listener are undocumented
+        # multiprocessing internals (present in CPython 3.8 to 3.13). Without
+        # them, workers still exit at their next poll and the server's daemon
+        # threads end with this process.
+        refcounts = getattr(self._server, "id_to_refcount", None)
+        deadline = time.monotonic() + grace
+        while refcounts and time.monotonic() < deadline:
+            time.sleep(0.1)
+        stop_event = getattr(self._server, "stop_event", None)
+        if stop_event is not None:
+            stop_event.set()
+        listener = getattr(self._server, "listener", None)
+        if listener is not None:
+            listener.close()
+
+    def submit(self, func, task, results_hash:str) -> Future:
+        # Queue one shard for workers holding the model with results_hash
+        shard = _Shard(func, task, results_hash)
+        with self._lock:
+            shard_id = next(self._ids)
+            self._shards[shard_id] = shard
+        self._tasks.put((shard_id, func, task, results_hash))
+        return shard.future
+
+    def pool(self, results_hash:str) -> "ClusterPool":
+        # Worker pool interface for one model, see Monte_Carlo_Sim.worker_pool()
+        return ClusterPool(self, results_hash)
+
+    def __retry(self, shard_id:int, reason:str):
+        # Queue a shard again, or fail it after max_retries (lock held)
+        shard = self._shards[shard_id]
+        shard.attempts += 1
+        if shard.attempts > self.max_retries:
+            del self._shards[shard_id]
+            shard.future.set_exception(RuntimeError("Shard failed {} times, last: {}".format(shard.attempts, reason)))
+            return
+        shard.deadline = None
+        self._tasks.put((shard_id, shard.func, shard.task, shard.results_hash))
+
+    def __collect(self):
+        # Resolve shards as workers report back, and retry the ones that were lost
+        while not self._closed.is_set():
+            try:
+                status, shard_id, payload = self._results.get(timeout=1)
+            except queue.Empty:
+                status = None
+            now = time.monotonic()
+            with self._lock:
+                shard = self._shards.get(shard_id) if status is not None else None
+                if shard is not None:
+                    # Late results of retried shards are ignored
+                    if status == "started":
+                        shard.deadline = now + self.timeout
+                    elif status == "done":
+                        del self._shards[shard_id]
+                        shard.future.set_result(payload)
+                    else:
+                        self.__retry(shard_id, payload)
+                queued = self._tasks.qsize()
+                for shard_id, shard in list(self._shards.items()):
+                    if shard.deadline is None and queued == 0:
+                        # Taken off the queue by a worker that died before starting it
+                        shard.deadline = now + self.timeout
+                    elif shard.deadline is not None and now > shard.deadline:
+                        self.__retry(shard_id, "no result after {}s".format(self.timeout))
+
+class ClusterPool:
+    # The calls Monte_Carlo_Sim makes on its worker pool, run as shards of one model
+
+    def __init__(self, coordinator:Coordinator, results_hash:str):
+        self.coordinator = coordinator
+        self.results_hash = results_hash
+
+    def apply_async(self, func, args:tuple) -> ShardResult:
+        return ShardResult(self.coordinator.submit(func, args[0], self.results_hash))
+
+    def imap(self, func, tasks):
+        # Results in task order
+        for future in [self.coordinator.submit(func, task, self.results_hash) for task in tasks]:
+            yield future.result()
+
+    def imap_unordered(self, func, tasks):
+        # Results as shards complete
+        futures = [self.coordinator.submit(func, task, self.results_hash) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+def _connect(address:tuple[str, int], authkey:bytes) -> tuple:
+    manager = type("WorkerManager", (BaseManager,), {})
+    manager.register("tasks")
+    manager.register("results")
+    client = manager(address=address, authkey=authkey)
+    client.connect()
+    return client.tasks(), client.results()
+
+def _work(address:tuple[str, int], authkey:bytes, artifact:str, pool_size:int):
+    # One worker process: simulate shards until the coordinator goes away
+    sim = Monte_Carlo_Sim(pool_size, artifact=artifact)
+    # Shard functions run on the worker model, as in the local pool
+    monte_carlo._init_worker(sim)
+    tasks, results = _connect(address, authkey)
+    name = "{}:{}".format(socket.gethostname(), os.getpid())
+    while True:
+        try:
+            shard = tasks.get(timeout=1)
+        except queue.Empty:
+            continue
+        except (EOFError, OSError):
+            return
+        if shard is None:
+            return
+        shard_id, func, task, results_hash = shard
+        try:
+            results.put(("started", shard_id, name))
+            if results_hash != sim.results_hash:
+                raise ValueError("Worker {} has results hash {}, not {}".format(name, sim.results_hash[:12],
+                                                                                results_hash[:12]))
+            results.put(("done", shard_id, func(task)))
+        except (EOFError, OSError):
+            return
+        except Exception:
+            try:
+                results.put(("failed", shard_id, "{}: {}".format(name, traceback.format_exc(limit=3))))
+            except (EOFError, OSError):
+                return
+
+def run_worker(address:tuple[str, int]=DEFAULT_ADDRESS, authkey:bytes=DEFAULT_AUTHKEY,
+               processes:int|None=None, artifact:str="./data/model.pkl",
+               pool_size:int=4096) -> list[Process]:
+    """Start worker processes that simulate shards for a Coordinator.
+
+    Each process loads its own model (from the artifact, or ./data) and only
+    accepts shards for the same results hash as the coordinator's sim, so
+    pool_size must match the coordinating sim's.
+
+    Args:
+        address: (host, port) of the coordinator
+        authkey: The coordinator's authkey
+        processes: Number of worker processes (default all cores)
+        artifact: Model artifact path on this host
+        pool_size: Variate pool size of the worker models
+
+    Returns:
+        The started processes, which exit when the coordinator closes.
+    """
+    workers = [Process(target=_work, args=(address, authkey, artifact, pool_size), daemon=True)
+               for _ in range(processes or os.cpu_count())]
+    for worker in workers:
+        worker.start()
+    return workers
+
+if __name__ == "__main__":
+    freeze_support()
+    parser = argparse.ArgumentParser(description="Run simulation workers for a remote coordinator")
+    parser.add_argument("role", choices=["worker"])
+    parser.add_argument("--address", default="{}:{}".format(*DEFAULT_ADDRESS), help="coordinator host:port")
+    parser.add_argument("--authkey", default=DEFAULT_AUTHKEY.decode(), help="coordinator authkey")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default all cores)")
+    parser.add_argument("--pool-size", type=int, default=4096, help="variate pool size, as on the coordinator's sim")
+    args = parser.parse_args()
+    host, port = args.address.rsplit(":", 1)
+    for worker in run_worker((host, int(port)), args.authkey.encode(), args.processes, pool_size=args.pool_size):
+        worker.join()
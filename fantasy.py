@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+from multiprocessing import freeze_support
+from tqdm import tqdm
+from monte_carlo import Monte_Carlo_Sim, STAT_NAMES
+
+# Points per unit of each stat
+SCORING = {"standard":{"pass_yards":0.04,"pass_tds":4,"ints":-2,"rush_yards":0.1,
+                       "rush_tds":6,"rec":0,"rec_yards":0.1,"rec_tds":6}}
+SCORING["half_ppr"] = {**SCORING["standard"], "rec":0.5}
+SCORING["ppr"] = {**SCORING["standard"], "rec":1}
+
+def scoring_weights(rules:str|dict[str, float]="ppr", stat_names:list[str]=STAT_NAMES) -> np.ndarray:
+    """Points per unit of each stat, in stat_names order.
+
+    Args:
+        rules: Name of a SCORING preset ("standard", "half_ppr", "ppr") or a
+            custom {stat: points} dictionary (unlisted stats score 0)
+        stat_names: Stat names along the stat axis
+    """
+    rules = SCORING[rules] if isinstance(rules, str) else rules
+    unknown = set(rules) - set(stat_names)
+    if unknown:
+        raise ValueError("Unknown stats in scoring rules: {}".format(", ".join(sorted(unknown))))
+    return np.array([rules.get(stat, 0) for stat in stat_names], dtype=float)
+
+def fantasy_points(stats:np.ndarray, rules:str|dict[str, float]="ppr",
+                   stat_names:list[str]=STAT_NAMES) -> np.ndarray:
+    # Fantasy points of a (..., stats) array, e.g. (games, players, stats) -> (games, players)
+    return np.asarray(stats, dtype=float) @ scoring_weights(rules, stat_names)
+
+def sim_slate(sim:Monte_Carlo_Sim, matchups:list[tuple[str, str]], n:int, cpu_count:int,
+              rules:str|dict[str, float]="ppr", engine="game", seed:int|None=None,
+              cache=None) -> dict[tuple[str, str], tuple[list[str], np.ndarray]]:
+    """Per-game fantasy points of every player in a slate of matchups.
+
+    Each matchup's games are scored batch by batch as they come back from the
+    worker pool (see Monte_Carlo_Sim.iter_sim()), so only the points are kept.
+
+    Returns:
+        Dictionary of (home, away): (players, (n, players) points array), with
+        players as in Monte_Carlo_Sim.matchup_players(). Points of one row come
+        from the same game, keeping teammates' and opponents' correlation.
+    """
+    weights = scoring_weights(rules)
+    slate = dict()
+    for home, away in tqdm(matchups):
+        batches = sim.iter_sim(home, away, n, cpu_count, engine=engine, seed=seed, cache=cache)
+        points = np.concatenate([stats.astype(float) @ weights for _, _, stats in batches])
+        slate[(home, away)] = (sim.matchup_players(home, away), points)
+    return slate
+
+def slate_points(slate:dict[tuple[str, str], tuple[list[str], np.ndarray]]) -> dict[str, np.ndarray]:
+    # Per-game points of each player in a slate from sim_slate()
+    return {player:points[:, p] for players, points in slate.values() for p, player in enumerate(players)}
+
+def season_points(weeks:list[dict], n_seasons:int, rng:np.random.Generator|None=None) -> dict[str, np.ndarray]:
+    """Season total points of each player over n_seasons sampled seasons.
+
+    Every season draws one simulated game per matchup and week, shared by all
+    of the matchup's players, and adds up each player's points.
+
+    Args:
+        weeks: Slates from sim_slate(), one per week
+        n_seasons: Number of seasons to sample
+        rng: numpy Generator (default unseeded)
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    totals = dict()
+    for slate in weeks:
+        for players, points in slate.values():
+            games = points[rng.integers(len(points), size=n_seasons)]
+            for p, player in enumerate(players):
+                totals[player] = totals[player] + games[:, p] if player in totals else games[:, p]
+    return totals
+
+def projections(points:dict[str, np.ndarray], floor:float=0.1, ceiling:float=0.9) -> pd.DataFrame:
+    """Mean, standard deviation, floor, median and ceiling of each player's points.
+
+    Args:
+        points: Dictionary of player: samples, all of the same length (per-game
+            points from slate_points() or season totals from season_points())
+        floor: Quantile reported as the floor
+        ceiling: Quantile reported as the ceiling
+
+    Returns:
+        DataFrame indexed by player, sorted by mean points.
+    """
+    players = list(points)
+    samples = np.stack([points[player] for player in players])
+    quantiles = np.quantile(samples, [floor, 0.5, ceiling], axis=1)
+    table = pd.DataFrame({"mean":samples.mean(axis=1), "std":samples.std(axis=1, ddof=1),
+                          "floor":quantiles[0], "median":quantiles[1], "ceiling":quantiles[2]},
+                         index=pd.Index(players, name="player"))
+    return table.sort_values("mean", ascending=False)
+
+if __name__ == "__main__":
+    freeze_support()
+    from projections import season, sim, seed
+    weeks = [sim_slate(sim, season[week], 200, 10, "ppr", engine="batch", seed=seed) for week in season]
+    print(projections(slate_points(weeks[0])).head(20).round(1))
+    print(projections(season_points(weeks, 10000, np.random.default_rng(seed))).head(20).round(1))
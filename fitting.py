@@ -0,0 +1,48 @@
+import hashlib
+import numpy as np
+import scipy.stats as st
+from multiprocessing import Pool
+import warnings
+
+def data_fingerprint(dist_name:str, data:np.ndarray) -> str:
+    # Identifies the exact rows a distribution was fit to
+    digest = hashlib.sha256(dist_name.encode())
+    digest.update(np.ascontiguousarray(data, dtype=float).tobytes())
+    return digest.hexdigest()
+
+def fit_distribution(dist_name:str, data:np.ndarray, warm_start:list|None=None) -> list[float]:
+    """Maximum likelihood fit of a scipy distribution.
+
+    Args:
+        dist_name: Name of the scipy.stats distribution (e.g. "genextreme")
+        data: 1-D array of observations
+        warm_start: Previously fitted params (shapes..., loc, scale) used as
+            the optimizer's starting point
+
+    Returns:
+        Fitted params as a list of floats, in scipy's (shapes..., loc, scale) order.
+    """
+    dist = getattr(st, dist_name)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if warm_start is None:
+            params = dist.fit(data)
+        else:
+            params = dist.fit(data, *warm_start[:-2], loc=warm_start[-2], scale=warm_start[-1])
+    return [float(param) for param in params]
+
+def fit_distributions(tasks:list[tuple], cpus:int|None=None) -> list[list[float]]:
+    """Fit many distributions across a process pool.
+
+    Args:
+        tasks: List of (dist_name, data, warm_start) argument tuples for
+            fit_distribution()
+        cpus: Number of worker processes (None = all cores)
+
+    Returns:
+        Fitted params for each task, in task order.
+    """
+    if len(tasks) <= 1 or cpus == 1:
+        return [fit_distribution(*task) for task in tasks]
+    with Pool(cpus) as pool:
+        return pool.starmap(fit_distribution, tasks, chunksize=1)
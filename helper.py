@@ -1,7 +1,7 @@
 import pandas as pd
-import numpy as np
 from time import time
 from monte_carlo import Monte_Carlo_Sim
+from results_store import ResultsStore
 
 def reshape_team_stats(team:str) -> pd.DataFrame:
     roster_df = pd.read_csv("./data/teams.csv", index_col=0)
@@ -17,13 +17,9 @@ def reshape_team_stats(team:str) -> pd.DataFrame:
 
 def get_player_stats(team:str, matchup:str) -> pd.DataFrame:
     team_stats = reshape_team_stats(team)
-    game_file = "./results/" + matchup + "stats.csv"
-    stat_df = pd.read_csv(game_file, header=[0,1], index_col=0)
-    stats = ["pass_yards","pass_tds","ints","rush_yards","rush_tds","rec","rec_yards",
-             "rec_tds"]
-    for stat in stats:
-        team_stats[stat] = team_stats["Player"].apply(lambda x: 
-                                            np.mean(stat_df[stat].get(x,0)))
+    store = ResultsStore("./results/" + matchup)
+    for stat in store.stat_names:
+        team_stats[stat] = team_stats["Player"].apply(lambda x: store.mean(stat, x))
     return team_stats
 
 def time_test(sim:Monte_Carlo_Sim, type:str, n:int, cpu:int, verbose=False,
@@ -0,0 +1,62 @@
+import json
+import threading
+from collections import defaultdict
+
+class PhaseProfile:
+    """Call counters and cumulative wall-clock timers per simulation phase.
+
+    Monte_Carlo_Sim.sim_game() records each snap's phases (playcall, the play
+    itself by play type, and the bookkeeping of score, downs and possession)
+    plus whole games into the sim's profiler when one is set. Profiles from
+    worker processes are merged into the parent's profiler, so one profile
+    covers every game of a parallel run. Games running on several threads can
+    share one profile.
+
+    Typical usage example:
+
+        sim.profiler = PhaseProfile()
+        sim.parallel_sim("PHI","DAL",1000,4)
+        sim.profiler.save("./results/profile.json")
+
+    Attributes:
+        counts: Number of times each phase ran
+        seconds: Total seconds spent in each phase
+    """
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_lock")
+        return state
+
+    def __setstate__(self, state:dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add(self, phase:str, seconds:float):
+        with self._lock:
+            self.counts[phase] += 1
+            self.seconds[phase] += seconds
+
+    def merge(self, other:"PhaseProfile") -> "PhaseProfile":
+        with self._lock:
+            for phase, count in other.counts.items():
+                self.counts[phase] += count
+                self.seconds[phase] += other.seconds[phase]
+        return self
+
+    def to_dict(self) -> dict[str, dict]:
+        # Count, total seconds, mean microseconds and share of game time per phase
+        game_seconds = self.seconds.get("game", 0)
+        return {phase:{"count":count, "seconds":self.seconds[phase],
+                       "mean_us":1e6*self.seconds[phase]/count,
+                       "share":self.seconds[phase]/game_seconds if game_seconds else None}
+                for phase, count in sorted(self.counts.items())}
+
+    def save(self, path:str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,117 @@
+import threading
+import numpy as np
+from monte_carlo import Monte_Carlo_Sim, STAT_NAMES
+from results_store import save_results
+
+# Games per batch of a job. Small batches keep progress updates frequent and
+# cancellation quick, at a small cost in per-batch overhead.
+JOB_BATCH_SIZE = 200
+
+class SimJob:
+    """One matchup simulation run in the background.
+
+    run() is meant to be called on a worker thread (e.g. through an executor
+    shared by every session). It streams batches from
+    Monte_Carlo_Sim.iter_sim() and keeps them behind a lock, so the UI thread
+    can poll progress and partial scores while the job runs and cancel it at
+    any time. A cancelled job stops after the batches already queued on the
+    worker pool. Jobs with the same cpu_count can run on several threads at
+    once. They share the sim's worker pool, and their batches interleave on
+    it.
+
+    Typical usage example:
+
+        job = SimJob(sim, "PHI", "DAL", 10000, 4, seed=0)
+        executor.submit(job.run)
+        completed, n = job.progress()
+        home_scores, away_scores = job.partial_scores()
+
+    Attributes:
+        home, away: Team abbreviations
+        n: Number of games to simulate
+        export_path: Results store path for the job's player stats (None to
+            skip exporting)
+    """
+
+    def __init__(self, sim:Monte_Carlo_Sim, home:str, away:str, n:int, cpu_count:int,
+                 seed:int|None=None, cache=None, engine="game", export_path:str|None=None,
+                 batch_size:int=JOB_BATCH_SIZE):
+        self.sim = sim
+        self.home = home
+        self.away = away
+        self.n = n
+        self.cpu_count = cpu_count
+        self.seed = seed
+        self.cache = cache
+        self.engine = engine
+        self.export_path = export_path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._started = threading.Event()
+        self._done = threading.Event()
+        self._batches = list()
+        self._completed = 0
+
+    def run(self):
+        # Simulate the games, stopping early if cancelled
+        with self._lock:
+            self._started.set()
+        try:
+            if self._cancel.is_set():
+                return
+            batches = self.sim.iter_sim(self.home, self.away, self.n, self.cpu_count, engine=self.engine,
+                                        batch_size=self.batch_size, seed=self.seed, cache=self.cache)
+            try:
+                for batch in batches:
+                    with self._lock:
+                        self._batches.append(batch)
+                        self._completed += len(batch[0])
+                    if self._cancel.is_set():
+                        return
+            finally:
+                batches.close()
+            if self.export_path is not None:
+                home_scores, away_scores, stats = self.results()
+                save_results(self.export_path, self.sim.matchup_players(self.home, self.away), STAT_NAMES,
+                             stats, home_scores, away_scores)
+        finally:
+            self._done.set()
+
+    def cancel(self):
+        # A job cancelled while still queued may never run (its executor
+        # future is cancelled with it), so it is done right away
+        with self._lock:
+            self._cancel.set()
+            if not self._started.is_set():
+                self._done.set()
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def started(self) -> bool:
+        # False while the job waits in the executor's queue
+        return self._started.is_set()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def progress(self) -> tuple[int, int]:
+        # Games completed so far and games requested
+        return self._completed, self.n
+
+    def results(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Home scores, away scores and stats of every game completed so far
+        with self._lock:
+            batches = list(self._batches)
+        if not batches:
+            players = self.sim.matchup_players(self.home, self.away)
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros((0, len(players), len(STAT_NAMES)))
+        return tuple(np.concatenate(arrays) for arrays in zip(*batches))
+
+    def partial_scores(self) -> tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            batches = list(self._batches)
+        if not batches:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+        return np.concatenate([batch[0] for batch in batches]), np.concatenate([batch[1] for batch in batches])
@@ -0,0 +1,136 @@
+import json
+import os
+import numpy as np
+from monte_carlo import Monte_Carlo_Sim
+
+# Bump whenever the on-disk layout changes
+MATRIX_VERSION = 1
+# Default quantiles of the home-minus-away margin
+SPREAD_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+def sim_matrix(sim:Monte_Carlo_Sim, n:int, cpu_count:int, teams:list[str]|None=None,
+               matchups:list[tuple[str, str]]|None=None, path:str="./results/matrix",
+               quantiles:tuple[float, ...]=SPREAD_QUANTILES, engine="game", seed:int|None=None,
+               cache=None, progress=None) -> "MatchupMatrix":
+    """Simulate every home/away pairing of a set of teams in one job.
+
+    All matchups are queued on the sim's worker pool at once (see
+    Monte_Carlo_Sim.iter_matchups()), and each is reduced to a handful of
+    numbers that are written into memory-mapped arrays as it completes. Games
+    are never kept, so memory does not grow with n or the number of matchups.
+
+    The matrix is a directory holding:
+        index.json: teams, quantiles and run settings
+        mean_scores.npy: float32 [home, away, home/away score]
+        win_prob.npy: float32 [home, away, home win/tie/away win]
+        spread.npy: float32 [home, away, mean/standard error] of the home margin
+        spread_quantiles.npy: float32 [home, away, quantile] of the home margin
+        completed.npy: bool [home, away], which matchups have been simulated
+    Matchups that were not simulated hold NaN.
+
+    Args:
+        sim: Monte Carlo Sim object
+        n: Number of games per matchup (int)
+        cpu_count: Number of cores to use (int)
+        teams: Teams to pair up (default all 32, giving 32x31 matchups)
+        matchups: Explicit (home, away) matchups to simulate instead of every
+            pairing of teams
+        path: Matrix directory (created if missing)
+        quantiles: Quantiles of the home margin to store
+        engine: "game" (sim_game) or "batch" (sim_batch)
+        seed: Seed for a reproducible matrix (int)
+        cache: ResultCache for seeded runs
+        progress: Shiny UI object for displaying simulation progress
+
+    Returns:
+        MatchupMatrix view of the written matrix.
+    """
+    teams = list(teams) if teams is not None else sim.teams
+    if matchups is None:
+        matchups = [(home, away) for home in teams for away in teams if home != away]
+    else:
+        teams = list(dict.fromkeys([team for matchup in matchups for team in matchup]))
+    codes = {team:i for i, team in enumerate(teams)}
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "index.json"), "w") as f:
+        json.dump({"version":MATRIX_VERSION, "teams":teams, "quantiles":list(quantiles), "n":n,
+                   "engine":engine, "seed":seed, "model_hash":sim.model_hash}, f)
+    shape = (len(teams), len(teams))
+    arrays = {name:np.lib.format.open_memmap(os.path.join(path, name + ".npy"), mode="w+",
+                                             dtype=np.float32, shape=shape + (depth,))
+              for name, depth in (("mean_scores", 2), ("win_prob", 3), ("spread", 2),
+                                  ("spread_quantiles", len(quantiles)))}
+    for array in arrays.values():
+        array[:] = np.nan
+    completed = np.lib.format.open_memmap(os.path.join(path, "completed.npy"), mode="w+", dtype=bool, shape=shape)
+    completed[:] = False
+    for done, (i, summary) in enumerate(sim.iter_matchups(matchups, n, cpu_count, engine, seed=seed, cache=cache)):
+        cell = codes[matchups[i][0]], codes[matchups[i][1]]
+        arrays["mean_scores"][cell] = summary.score_mean()
+        arrays["win_prob"][cell] = summary.win_prob()
+        arrays["spread"][cell] = summary.spread()
+        arrays["spread_quantiles"][cell] = summary.spread_quantile(quantiles)
+        completed[cell] = True
+        if progress is not None:
+            progress.set(done+1, message="Simulating Matchups")
+    for array in list(arrays.values()) + [completed]:
+        array.flush()
+    return MatchupMatrix(path)
+
+class MatchupMatrix:
+    """Read-only, memory-mapped view of a matrix written by sim_matrix().
+
+    Typical usage example:
+
+        matrix = MatchupMatrix("./results/matrix")
+        matrix.win_prob("PHI", "DAL")
+        matrix.power_ratings()
+
+    Attributes:
+        teams: Teams along the home and away axes
+        quantiles: Quantiles along the last axis of spread_quantiles
+        n: Number of games per matchup
+    """
+
+    def __init__(self, path:str):
+        self.path = path
+        with open(os.path.join(path, "index.json"), "r") as f:
+            index = json.load(f)
+        if index["version"] != MATRIX_VERSION:
+            raise ValueError("Unsupported matrix version: {}".format(index["version"]))
+        self.teams = index["teams"]
+        self.quantiles = index["quantiles"]
+        self.n = index["n"]
+        self._codes = {team:i for i, team in enumerate(self.teams)}
+        self.arrays = {name:np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+                       for name in ("mean_scores", "win_prob", "spread", "spread_quantiles", "completed")}
+
+    def __cell(self, home:str, away:str) -> tuple[int, int]:
+        return self._codes[home], self._codes[away]
+
+    def mean_scores(self, home:str, away:str) -> tuple[float, float]:
+        return tuple(self.arrays["mean_scores"][self.__cell(home, away)].tolist())
+
+    def win_prob(self, home:str, away:str) -> tuple[float, float, float]:
+        # Probability of a home win, tie and away win
+        return tuple(self.arrays["win_prob"][self.__cell(home, away)].tolist())
+
+    def spread(self, home:str, away:str) -> tuple[float, float]:
+        # Mean home margin and its standard error
+        return tuple(self.arrays["spread"][self.__cell(home, away)].tolist())
+
+    def spread_quantiles(self, home:str, away:str) -> dict[float, float]:
+        return dict(zip(self.quantiles, self.arrays["spread_quantiles"][self.__cell(home, away)].tolist()))
+
+    def power_ratings(self) -> dict[str, float]:
+        """Average margin of each team over every simulated matchup it played.
+
+        Home and away games are weighted equally, so home field effects cancel
+        for a full matrix. Teams are sorted from best to worst.
+        """
+        spread = np.asarray(self.arrays["spread"][..., 0], dtype=float)
+        ratings = dict()
+        for team, i in self._codes.items():
+            margins = np.concatenate([spread[i, :], -spread[:, i]])
+            ratings[team] = float(np.nanmean(margins)) if np.isfinite(margins).any() else np.nan
+        return dict(sorted(ratings.items(), key=lambda rating: -rating[1]))
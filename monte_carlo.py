@@ -1,18 +1,172 @@
 import numpy as np
 import scipy.stats as st
 import pandas as pd
-from time import time
-from sklearn.linear_model import LogisticRegression
-from collections import defaultdict
+from time import time, perf_counter
+from collections import defaultdict, deque
 import warnings
 from tqdm import tqdm
-import istarmap
+from sampling import VariatePool, QuantileTable, build_alias, alias_draw, alias_sample, stream_rng
+from artifact import source_hash, save_artifact, load_artifact
+from fitting import data_fingerprint, fit_distribution, fit_distributions
+from aggregation import SimSummary
+from results_store import save_results
+from instrumentation import PhaseProfile
 from multiprocessing import Pool, freeze_support
+import hashlib
 import json
 import os
+import pickle
+import threading
 warnings.filterwarnings("ignore", category=UserWarning)
 pd.options.mode.chained_assignment = None
 
+# Order of the stat axis in batch results
+STAT_NAMES = ["pass_yards","pass_tds","ints","rush_yards","rush_tds",
+              "rec", "rec_yards", "rec_tds"]
+# Column of each stat in sim_game()'s per-game accumulator
+PASS_YARDS, PASS_TDS, INTS, RUSH_YARDS, RUSH_TDS, REC, REC_YARDS, REC_TDS = range(len(STAT_NAMES))
+# Offensive skill positions tracked in player stats, in roster column order
+STAT_POSITIONS = ["qb","rb_1","rb_2","wr_1","wr_2","wr_3","wr_4","te_1","te_2"]
+# Compiled roster table columns (rushers are columns 0-2, targets 1-8)
+ROSTER_POSITIONS = STAT_POSITIONS + ["kicker","punter"]
+KICKER, PUNTER = 9, 10
+# Yardlines (yardline_100) at which field goal make probabilities are tabulated
+FG_YARDLINES = np.arange(101)
+# Playcall table axes
+DIST_TYPES = ("All","Short","Mid","Long")
+PLAY_TYPES = ("pass","run","field_goal","punt")
+# Upper bound on games per worker task, bounding worker memory for any n
+MAX_BATCH_SIZE = 10000
+# Games per random stream in seeded runs. Game i of a run with a given seed is
+# always simulated from stream i // SEED_BLOCKS[engine], so results only
+# depend on (seed, n, engine) and not on how the games are split across
+# workers. The batch engine needs large blocks to stay vectorized.
+SEED_BLOCKS = {"game":100, "batch":2500, "common":2500}
+# Version of the simulation engines' random draws. Bump it whenever a change
+# alters the games of a seeded run, so cached results of older runs are not
+# reused (see Monte_Carlo_Sim.results_hash).
+ENGINE_VERSION = 1
+# Random decisions of a snap in the common random numbers engine, each game
+# gets one uniform per decision and snap (see sim_batch())
+COMMON_DRAWS = ("playcall","target","interception","int_return","completion","air_yards",
+                "yac","pass_def","rusher","rush_yards","rush_def","field_goal","punt")
+# Per-team tables filled in by build_teams(), each indexed by team code
+TEAM_TABLES = ("_rusher_table","_target_table","_passer_table","_kicker_table",
+               "_punter_table","_rush_def_table","_pass_def_table")
+# Fitted yardage distribution params, and the data fingerprint each was fit to
+PARAMS_FILE = "./data/params.json"
+FIT_INDEX_FILE = "./data/params_index.json"
+# Yardage distributions by type: id column, yardage column and scipy distribution
+# (Normal distribution for punts, inverse gaussian for yac, genextreme for all others)
+ID_KEYS = {"punt":"punter_player_id","rb":"rusher_player_id",
+           "rush_def":"defteam","ay":"passer_player_id",
+           "yac":"receiver_player_id", "pass_def":"defteam"}
+YARD_KEYS = {"punt":"kick_distance","rb":"yards_gained_rush",
+             "rush_def":"yards_gained_rush","ay":"air_yards",
+             "yac":"yards_after_catch", "pass_def":"yards_gained_pass"}
+DIST_NAMES = {"punt":"norm", "rb":"genextreme","rush_def":"genextreme",
+              "ay":"genextreme","yac":"invgauss","pass_def":"genextreme"}
+# Offensive line yards before contact for 2024
+OL_YBC = {"ATL":2.2,"BUF":2.5,"CAR":2.7,"CHI":2.5,"CIN":2.7,"CLE":2.5,
+          "IND":2.9,"ARI":3.0,"DAL":2.1,"DEN":2.4,"DET":2.6,"GB":2.4,
+          "HOU":2.4,"JAX":2.0,"KC":2.4,"MIA":2.3,"MIN":2.3,"NO":2.5,
+          "NE":2.4,"NYG":2.5,"NYJ":2.1,"TEN":2.1,"PIT":2.2,"PHI":3.2,
+          "LV":1.9,"LAR":2.2,"BAL":3.3,"LAC":2.0,"SEA":2.4,"SF":2.7,
+          "TB":2.8,"WAS":2.9}
+# Punt Returner projections from Mike Clay: https://g.espncdn.com/s/ffldraftkit/25/NFLDK2025_CS_ClayProjections2025.pdf?adddata=2025CS_ClayProjections2025
+PUNT_RETURNERS = {"ATL":258/27,"BUF":317/28,"CAR":231/27,"CHI":257/29,
+                  "CIN":259/27,"CLE":252/27,"IND":283/28,"ARI":272/28,
+                  "DAL":276/27,"DEN":443/29,"DET":410/31,"GB":258/29,
+                  "HOU":290/30,"JAX":259/27,"KC":266/28,"MIA":214/28,
+                  "MIN":284/30,"NO":258/27,"NE":437/29,"NYG":228/29,
+                  "NYJ":230/29,"TEN":252/27,"PIT":317/30,"PHI":247/28,
+                  "LV":258/27,"LAR":264/28,"BAL":288/30,"LAC":336/27,
+                  "SEA":206/30,"SF":237/27,"TB":235/28,"WAS":243/25}
+
+class GameState:
+    """Everything that changes while a single game is simulated.
+
+    sim_game() creates one per game and passes it explicitly to the per-play
+    functions, so the model itself is never written to while simulating and
+    one Monte_Carlo_Sim can run games on several threads at once.
+
+    Attributes:
+        down, distance, yardline: Current down, yards to go and yardline_100
+        pos_team, def_team: Team codes of the offense and defense
+        rng: numpy Generator for the game's playcalls and outcomes
+        pools: Variate pools the game's yardage draws are served from, keyed by
+            distribution (see sampling.VariatePool)
+        pool_rng: Generator new pools refill from (None = fresh unseeded stream)
+        rows: Offset of each matchup player's row in stats, keyed by player code
+        stats: Flat (players x stats) accumulator of the game's player stats,
+            player code p's stat s is stats[rows[p] + s]
+        play_counts: Plays per play type, and per player for passes and runs
+            (only kept for verbose output)
+    """
+    __slots__ = ("down", "distance", "yardline", "pos_team", "def_team", "rng", "pools", "pool_rng",
+                 "rows", "stats", "play_counts")
+
+    def __init__(self, pos_team:int, def_team:int, rng:np.random.Generator, pools:dict,
+                 pool_rng:np.random.Generator|None, rows:dict[int, int]):
+        self.down, self.distance, self.yardline = 1, 10, 65
+        self.pos_team, self.def_team = pos_team, def_team
+        self.rng = rng
+        self.pools = pools
+        self.pool_rng = pool_rng
+        self.rows = rows
+        # A list, since single-element updates are much cheaper than on an ndarray
+        self.stats = [0.0]*(len(rows)*len(STAT_NAMES))
+        self.play_counts = {"pass":defaultdict(int),"run":defaultdict(int),"field_goal":0,"punt":0}
+
+# Model held by each worker process of the persistent pool, set once by _init_worker
+_worker_sim = None
+# Serializes worker pool creation, so threads sharing a sim share one pool
+_POOL_LOCK = threading.Lock()
+# Serializes lazy team construction (see Monte_Carlo_Sim.build_teams()) across threads
+_BUILD_LOCK = threading.Lock()
+
+def _init_worker(sim):
+    global _worker_sim
+    # With the fork start method (the Linux default) the model is inherited,
+    # not pickled, so __setstate__() never runs. Reset what it would: the
+    # parent's variate pools and Generator, which every worker would otherwise
+    # share a copy of, drawing the same stream.
+    sim._local = threading.local()
+    sim.profiler = None
+    _worker_sim = sim
+
+def _sim_task(task:tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Simulate one batch of games in a worker, returning compact arrays
+    home, away, n, engine, verbose, seed, start = task
+    home_scores, away_scores, stats = _worker_sim.simulate(home, away, n, engine, seed, start, verbose)
+    return home_scores.astype(np.int16), away_scores.astype(np.int16), stats.astype(np.float32)
+
+def _summary_task(task:tuple) -> SimSummary:
+    # Simulate one batch of games in a worker and return only its summary
+    home, away = task[:2]
+    summary = SimSummary(_worker_sim.matchup_players(home, away), STAT_NAMES)
+    summary.update(*_sim_task(task))
+    return summary
+
+def _profiled_task(profiled_task:tuple) -> tuple:
+    # Run a task function with phase profiling on, returning its result and the profile
+    func, task = profiled_task
+    _worker_sim.profiler = PhaseProfile()
+    try:
+        return func(task), _worker_sim.profiler
+    finally:
+        _worker_sim.profiler = None
+
+def _keyed_sim_task(keyed_task:tuple) -> tuple[int, int, tuple]:
+    # _sim_task() tagged with its matchup index and the index of its first game
+    key, task = keyed_task
+    return key, task[-1], _sim_task(task)
+
+def _keyed_summary_task(keyed_task:tuple) -> tuple[int, SimSummary]:
+    # _summary_task() tagged with the index of the matchup the batch belongs to
+    key, task = keyed_task
+    return key, _summary_task(task)
+
 class Monte_Carlo_Sim:
     """Class for simulating many NFL games at a play-by-play level.
     
@@ -21,23 +175,183 @@ class Monte_Carlo_Sim:
     tendencies. The load_data() and build_distributions() functions initialize
     these distributions based on historical data. The sim_game() function
     simulates a single game, which is called by run_simulations() and parallel_sim()
-    to simulate n games. 
+    to simulate n games. The sim_batch() function is a vectorized engine that
+    simulates n games in lockstep and is selected with engine="batch", or with
+    engine="common" to draw common random numbers (see sim_batch() and
+    scenarios.py).
 
     Typical usage example:
 
         sim = Monte_Carlo_Sim()
         home_scores, away_scores, stats = sim.parallel_sim("PHI","DAL",10000)
 
+    The fully built model is saved to a single artifact file (./data/model.pkl
+    by default) and reloaded on later starts, until any of the source CSVs or
+    params.json change. Each team's distributions and tables are only built
+    (or unpickled from the artifact) the first time one of its games is
+    simulated, see build_teams(). Simulating never writes to the model itself
+    (per-game state lives in a GameState), so one instance can run games on
+    several threads at once.
+
     Attributes:
         sim_stats:
-        verbose:
+        model_hash: Content hash of the source files the model was built from
+        profiler: PhaseProfile collecting per-phase timings of sim_game(), in
+            this process and in the workers (None, the default, disables it)
+        cluster: cluster.Coordinator that runs the worker pool's tasks on
+            other processes or hosts instead (None, the default, runs them on
+            the local worker pool)
 
     """
     
-    def __init__(self):
+    def __init__(self, pool_size:int=4096, artifact:str|None="./data/model.pkl"):
+        # Single-play draws in sim_game() are served from per-distribution pools
+        # of at most pool_size pre-drawn values, kept per thread
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self.profiler = None
+        self.cluster = None
+        self.model_hash = source_hash()
+        state = load_artifact(artifact, self.model_hash) if artifact else None
+        if state is not None:
+            self.__dict__.update(state)
+            self.__dict__.update(self.__empty_teams())
+            return
         # Load relevant data
         self.load_data()
         self.build_distributions()
+        self.compile_tables()
+        if artifact:
+            # The artifact serves every later start, so it holds every team
+            self.pack_teams()
+            # Building can write params.json, so hash the sources again
+            self.model_hash = source_hash()
+            save_artifact(artifact, self.model_state(), self.model_hash)
+
+    def model_state(self) -> dict:
+        # Everything needed to simulate, without the raw play-by-play data
+        excluded = ("_yard_data", "_fg_data", "_local", "pool_size", "model_hash", "_pool",
+                    "_pool_cpus", "sim_stats", "profiler", "cluster", "_team_models", "_dists", "_quantile_tables") + TEAM_TABLES
+        return {key:value for key, value in self.__dict__.items() if key not in excluded}
+
+    def __getstate__(self):
+        # Variate pools are per-thread buffers, workers refill their own. The
+        # worker pool and any simulation results stay in this process.
+        state = self.__dict__.copy()
+        # Workers only profile the tasks sent through _profiled_task()
+        state["profiler"] = None
+        state["cluster"] = None
+        for key in ("_local", "_pool", "_pool_cpus", "sim_stats"):
+            state.pop(key, None)
+        if self.__dict__.get("_team_blobs"):
+            # Workers unpickle only the teams they simulate
+            state.update(self.__empty_teams())
+        return state
+
+    def __setstate__(self, state:dict):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def teams(self) -> list[str]:
+        # Abbreviations of every team in the compiled rosters
+        return list(self._teams)
+
+    @property
+    def results_hash(self) -> str:
+        # Hash of everything seeded games depend on: the model, the engines and
+        # pool_size (variate pool refills draw from the game's random stream)
+        return hashlib.sha256(json.dumps([self.model_hash, self.pool_size, ENGINE_VERSION]).encode()).hexdigest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Shut down the persistent worker pool, if one is running
+        pool = self.__dict__.pop("_pool", None)
+        self.__dict__.pop("_pool_cpus", None)
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    def worker_pool(self, cpu_count:int) -> Pool:
+        """Persistent process pool whose workers hold a copy of this model.
+
+        Each worker gets the model once, through the pool initializer (pickled,
+        or inherited with the fork start method) and its own variate pools and
+        random stream. The pool is reused by later calls with the same
+        cpu_count, including calls from other threads, which share it. A
+        different cpu_count replaces the pool, so threads sharing a sim should
+        use one cpu_count. With a cluster set, tasks go to the cluster instead,
+        and cpu_count should be its total number of worker processes.
+        """
+        if self.__dict__.get("cluster") is not None:
+            # Shards carry the results hash as of now, e.g. after a refit()
+            return self.cluster.pool(self.results_hash)
+        with _POOL_LOCK:
+            if self.__dict__.get("_pool_cpus") != cpu_count:
+                self.close()
+                self._pool = Pool(cpu_count, initializer=_init_worker, initargs=(self,))
+                self._pool_cpus = cpu_count
+            return self._pool
+
+    def __imap(self, cpu_count:int, func, tasks:list, ordered=True):
+        # Map func over tasks on the worker pool, merging worker phase profiles
+        # into the profiler when profiling
+        pool = self.worker_pool(cpu_count)
+        imap = pool.imap if ordered else pool.imap_unordered
+        if self.profiler is None:
+            yield from imap(func, tasks)
+            return
+        for result, profile in imap(_profiled_task, [(func, task) for task in tasks]):
+            self.profiler.merge(profile)
+            yield result
+
+    def __iwindow(self, cpu_count:int, func, tasks):
+        # Like __imap(), but tasks are consumed lazily with only two per core
+        # queued on the pool, so closing the generator stops the run
+        pool = self.worker_pool(cpu_count)
+        profiler = self.profiler
+        tasks = iter(tasks)
+        pending = deque()
+        while True:
+            for task in tasks:
+                if profiler is None:
+                    pending.append(pool.apply_async(func, (task,)))
+                else:
+                    pending.append(pool.apply_async(_profiled_task, ((func, task),)))
+                if len(pending) >= 2*cpu_count:
+                    break
+            if not pending:
+                return
+            result = pending.popleft().get()
+            if profiler is not None:
+                result, profile = result
+                profiler.merge(profile)
+            yield result
+
+    def __draw(self, state:GameState, dist) -> float:
+        pool = state.pools.get(dist)
+        if pool is None:
+            pool = state.pools[dist] = VariatePool(dist, self.pool_size, state.pool_rng)
+        return pool.draw()
+
+    def __thread_pools(self):
+        # Variate pools of the calling thread, used by games run without their own
+        local = self._local
+        if not hasattr(local, "pools"):
+            local.pools, local.rng = {}, None
+        return local
+
+    def seed_pools(self, rng:np.random.Generator|None):
+        # Refill the calling thread's variate pools from rng from now on (None = fresh unseeded stream)
+        local = self.__thread_pools()
+        local.rng = rng if rng is not None else np.random.default_rng()
+        for pool in local.pools.values():
+            pool.reseed(local.rng)
 
     def load_data(self):
         rush_data = pd.read_csv("./data/run_data.csv")
@@ -73,200 +387,432 @@ class Monte_Carlo_Sim:
         name_dict = {id: name for name, id in self.__id_dict.items()}
         return [name_dict[id] for id in player_ids]
     
-    def __determine_dist_type(self, down:int, distance:float) -> str:
+    def __determine_dist_type(self, down:int, distance:float) -> int:
+        # Index into DIST_TYPES ("All", "Short", "Mid", "Long")
         if down == 1:
-            return "All"
+            return 0
         else:
             if distance < 4:
-                return "Short"
+                return 1
             elif distance > 6:
-                return "Long"
+                return 3
             else:
-                return "Mid"
+                return 2
 
-    def __print_play_type(self, play_type:str, args):
+    def __print_play_type(self, state:GameState, play_type:str, args):
         match play_type:
             case "pass":
-                self._play_counts[play_type][args[2]] += 1
-                print("Result of play: {} to {} for {:.1f} yards, to the {:.0f} yardline".format(play_type,args[2],args[0],args[1]))
+                state.play_counts[play_type][self._players[args[2]]] += 1
+                print("Result of play: {} to {} for {:.1f} yards, to the {:.0f} yardline".format(play_type,self._players[args[2]],args[0],args[1]))
             case "run":
-                self._play_counts[play_type][args[2]] += 1
-                print("Result of play: {} by {} for {:.1f} yards, to the {:.0f} yardline".format(play_type,args[2],args[0],args[1]))
+                state.play_counts[play_type][self._players[args[2]]] += 1
+                print("Result of play: {} by {} for {:.1f} yards, to the {:.0f} yardline".format(play_type,self._players[args[2]],args[0],args[1]))
             case "field_goal":
                 if args[0]:
-                    print("Result of play: Field Goal by {} is good!".format(args[1]))
+                    print("Result of play: Field Goal by {} is good!".format(self._players[args[1]]))
                 else:
-                    print("Result of play: Field Goal by {} is no good".format(args[1]))
+                    print("Result of play: Field Goal by {} is no good".format(self._players[args[1]]))
             case "punt":
                 print("Result of play: {}".format(play_type))
 
-    def build_distributions(self):
-        params_file = "./data/params.json"
-        self.__params = json.load(open(params_file, "r")) if os.path.exists(params_file) else defaultdict(dict)
-        # Get player names
-        rbs = self._team_rosters[["qb","rb_1","rb_2"]].to_numpy().flatten().tolist()
-        kickers = self._team_rosters[["kicker"]].values.flatten().tolist()
-        punters = self._team_rosters[["punter"]].values.flatten().tolist()
-        teams = self._team_rosters[["team"]].values.flatten().tolist()
-        targets = self._team_rosters.iloc[:,3:11].to_numpy().flatten().tolist()
-        qbs = self._team_rosters[["qb"]].to_numpy().flatten().tolist()
-        # Fit Distributions/Models
-        self._rb_dists = {rb:self.build_yardage_distribution("rb",rb) for rb in self.get_ids(rbs)}
-        self._rush_def_dists = {defense:self.build_yardage_distribution("rush_def",defense) for defense in teams}
-        self._fg_dists = {kicker:self.fit_fg_model(kicker) for kicker in self.get_ids(kickers)}
-        self._punt_dists = {punter:self.build_yardage_distribution("punt",punter) for punter in self.get_ids(punters)}
-        self._ay_dists = {qb:self.build_yardage_distribution("ay",qb) for qb in self.get_ids(qbs)}
-        self._yac_dists = {target:self.build_yardage_distribution("yac",target) for target in self.get_ids(targets)}
-        self._pass_def_dists = {defense:self.build_yardage_distribution("pass_def",defense) for defense in teams}
-        # If params file doesn't exist, create one with the fitted params
-        if not os.path.exists("./data/params.json"):
-            with open("./data/params.json", "w") as f:
-                json.dump(self.__params, f)
+    def __entities(self) -> dict[str, list]:
+        # Ids of every player/defense needing a yardage distribution, by dist type
+        rosters = self._team_rosters
+        teams = rosters["team"].tolist()
+        return {"rb":self.get_ids(rosters[["qb","rb_1","rb_2"]].to_numpy().flatten().tolist()),
+                "rush_def":teams,
+                "punt":self.get_ids(rosters["punter"].tolist()),
+                "ay":self.get_ids(rosters["qb"].tolist()),
+                "yac":self.get_ids(rosters.iloc[:,3:11].to_numpy().flatten().tolist()),
+                "pass_def":teams}
+
+    def __fit_data(self, dist_type:str, id:str) -> np.ndarray:
+        data = self._yard_data[dist_type]
+        yard_data = data[data[ID_KEYS[dist_type]] == id][YARD_KEYS[dist_type]]
+        # Confirm there's enough specific data, otherwise use league average
+        yard_data = yard_data if len(yard_data) > 5 else data[YARD_KEYS[dist_type]]
+        return yard_data.dropna().to_numpy()
+
+    def __fit_params(self, cpus:int|None=None) -> list[tuple[str, str]]:
+        # Fit every distribution whose data changed since its last fit, save params
+        # Without an index (e.g. params.json from before it existed), the saved
+        # params are taken as fit to the current data and only indexed
+        seed_index = not os.path.exists(FIT_INDEX_FILE)
+        index = {} if seed_index else json.load(open(FIT_INDEX_FILE, "r"))
+        tasks, refits = {}, []
+        for dist_type, ids in self.__entities().items():
+            yard_key, dist_name = YARD_KEYS[dist_type], DIST_NAMES[dist_type]
+            for id in ids:
+                # Use "League Average" id if player is missing their gsis id
+                id = "LA" if isinstance(id, float) else id
+                data = self.__fit_data(dist_type, id)
+                fingerprint = data_fingerprint(dist_name, data)
+                previous = self.__params.get(yard_key, {}).get(id)
+                if previous is not None and (seed_index or index.get(yard_key, {}).get(id) == fingerprint):
+                    index.setdefault(yard_key, {})[id] = fingerprint
+                    continue
+                # Entities fit to identical rows (league average fallbacks) share one
+                # fit, warm-started from the previous params when there are any
+                tasks.setdefault(fingerprint, (dist_name, data, previous))
+                refits.append((yard_key, id, fingerprint))
+        fitted = dict(zip(tasks, fit_distributions(list(tasks.values()), cpus)))
+        for yard_key, id, fingerprint in refits:
+            self.__params.setdefault(yard_key, {})[id] = fitted[fingerprint]
+            index.setdefault(yard_key, {})[id] = fingerprint
+        with open(PARAMS_FILE, "w") as f:
+            json.dump(self.__params, f)
+        with open(FIT_INDEX_FILE, "w") as f:
+            json.dump(index, f)
+        return list(dict.fromkeys((yard_key, id) for yard_key, id, _ in refits))
+
+    def refit(self, cpus:int|None=None) -> list[tuple[str, str]]:
+        """Refit the yardage distributions whose underlying data changed.
+
+        Re-reads the source CSVs and fingerprints the rows each player/defense
+        distribution is fit to. Only entities whose rows changed since their
+        last fit (per params_index.json) are refit, across a process pool and
+        warm-started from their previous params. params.json is updated and
+        the distributions and lookup tables are rebuilt.
+
+        Args:
+            cpus: Number of processes to fit with (None = all cores)
+
+        Returns:
+            List of (yardage stat, id) keys that were refit.
+        """
+        # Workers would keep simulating the old model
+        self.close()
+        self.load_data()
+        refits = self.__fit_params(cpus)
+        self.build_distributions()
+        self.compile_tables()
+        self.model_hash = source_hash()
+        return refits
+
+    def build_distributions(self, cpus:int|None=None):
+        # Load the fitted params, distributions are built per team by build_teams()
+        self.__params = json.load(open(PARAMS_FILE, "r")) if os.path.exists(PARAMS_FILE) else dict()
+        if not os.path.exists(PARAMS_FILE):
+            # If params file doesn't exist, fit everything in parallel and create one
+            self.__fit_params(cpus)
 
     def build_yardage_distribution(self, dist_type:str, id:str):
         # Generalized function for building yardage distributions
-        id_keys = {"punt":"punter_player_id","rb":"rusher_player_id",
-                   "rush_def":"defteam","ay":"passer_player_id",
-                   "yac":"receiver_player_id", "pass_def":"defteam"}
-        yard_keys = {"punt":"kick_distance","rb":"yards_gained_rush",
-                     "rush_def":"yards_gained_rush","ay":"air_yards",
-                     "yac":"yards_after_catch", "pass_def":"yards_gained_pass"}
-        dists = {"punt":"norm", "rb":"genextreme","rush_def":"genextreme",
-                 "ay":"genextreme","yac":"invgauss","pass_def":"genextreme"}
-        # Normal distribution for punts, inverse gaussian for yac, genextreme for all others
-        dist = getattr(st, dists[dist_type])
+        dist = getattr(st, DIST_NAMES[dist_type])
         # Use "League Average" id if player is missing their gsis id
         id = "LA" if isinstance(id, float) else id
-        if os.path.exists("./data/params.json"):
-            # Get params from json file if it exists (pre-computed)
-            params = self.__params[yard_keys[dist_type]][id]
-        else:
-            data = self._yard_data[dist_type]
-            yard_data = data[data[id_keys[dist_type]] == id][yard_keys[dist_type]]
-            # Confirm there's enough specific data, otherwise use league average
-            yard_data = yard_data if len(yard_data) > 5 else data[yard_keys[dist_type]]
-            yard_data.dropna(inplace=True)
-            params = dist.fit(yard_data)
-            self.__params[yard_keys[dist_type]][id] = params
+        params = self.__params.setdefault(YARD_KEYS[dist_type], {}).get(id)
+        if params is None:
+            # Not in params.json (e.g. a new roster addition), fit it now
+            params = fit_distribution(DIST_NAMES[dist_type], self.__fit_data(dist_type, id))
+            self.__params[YARD_KEYS[dist_type]][id] = params
         yard_dist = dist(*params)
         return yard_dist
     
-    def fit_fg_model(self, kicker:str) -> LogisticRegression:
+    def fit_fg_model(self, kicker:str) -> tuple["LogisticRegression", np.ndarray]:
+        # sklearn is only needed to fit, simulations use the tabulated probabilities
+        from sklearn.linear_model import LogisticRegression
         fg_data = self._fg_data[self._fg_data["kicker_player_id"] == kicker]
         # Check there's enough FG specific data to be robust, otherwise use league average
         fg_data = fg_data if len(fg_data) > 5 else self._fg_data
         # Fit Sigmoid/logistic model for fg make probability
         fg_model = LogisticRegression(random_state=0).fit(fg_data[["yardline_100"]],
                                                           fg_data["result"])
-        return fg_model
-
-    def rush_yds(self) -> tuple[float, str]:
-        # Pick RB1 or RB2 based on snap counts
-        rushers = self._team_rosters[self._team_rosters["team"] == self.__pos_team]
-        rb = self.__rng.choice(rushers[["qb","rb_1","rb_2"]].iloc[0], 1, 
-                               p=list(self._rb_carries[self.__pos_team].values()))[0]
-        rb_id = self.get_ids([rb])[0]
+        # Tabulate make probability at every integer yardline (same column the sim has always used)
+        fg_table = fg_model.predict_proba(pd.DataFrame({"yardline_100":FG_YARDLINES}))[:,0]
+        return fg_model, fg_table
+
+    def compile_tables(self):
+        """Compile rosters, playcall profiles and usage rates into dense arrays.
+
+        Teams and players are mapped to integer codes (_team_codes/_player_codes)
+        and everything the per-play functions look up is stored in arrays
+        indexed by those codes, so no DataFrame is touched while simulating.
+        Categorical draws (playcall, rusher, target) use alias tables, which
+        sample in O(1) from a single uniform. The per-team yardage and FG
+        tables (TEAM_TABLES) are left empty here and filled in by build_teams().
+        """
+        rosters = self._team_rosters
+        self._teams = rosters["team"].tolist()
+        self._team_codes = {team:i for i, team in enumerate(self._teams)}
+        names = rosters[ROSTER_POSITIONS].to_numpy()
+        self._players = list(dict.fromkeys(names.ravel().tolist()))
+        self._player_codes = {player:i for i, player in enumerate(self._players)}
+        self._roster_table = np.vectorize(self._player_codes.get)(names)
+        # Playcall probabilities indexed by [team, down, distance bucket, red zone, play type]
+        playcall = np.zeros((len(self._teams), 5, len(DIST_TYPES), 2, len(PLAY_TYPES)))
+        # Teams of each coach (a variant can give two teams the same coach)
+        coaches = defaultdict(list)
+        for t, coach in enumerate(rosters["coach"]):
+            coaches[coach].append(t)
+        profiles = self._playcall_profiles[self._playcall_profiles["coach"].isin(coaches)]
+        for row in profiles.itertuples():
+            playcall[coaches[row.coach], row.down, DIST_TYPES.index(row.distance), int(row.red_zone)] = (
+                row.pass_prob, row.run_prob, row.fg_prob, row.punt_prob)
+        self._playcall_alias = build_alias(playcall)
+        self._rusher_alias = build_alias([list(self._rb_carries[team].values()) for team in self._teams])
+        self._target_alias = build_alias([list(self._target_rates[team].values()) for team in self._teams])
+        # Per-team player rates, indexed [team] or [team, slot]
+        ids = [self.get_ids(row) for row in names]
+        rbs = rosters[["rb_1","rb_2"]].to_numpy()
+        self.__dict__.update(self.__empty_teams())
+        self._team_blobs = {}
+        # Use league averages for rookies
+        avg_int = np.mean(list(self._int_rate.values()))
+        avg_comp = np.mean(list(self._comp_pct.values()))
+        avg_catch = np.mean(list(self._catch_pct.values()))
+        int_pct = np.array([self._int_rate.get(row[0], avg_int) for row in ids])
+        def_int_pct = np.array([self._def_ints[team] for team in self._teams])
+        # Interception probability indexed by [offense, defense]
+        self._int_prob = (int_pct[:, None] + def_int_pct[None, :])/2
+        comp_pct = np.array([self._comp_pct.get(row[0], avg_comp) for row in ids])
+        catch_pct = np.array([[self._catch_pct.get(id, avg_catch) for id in row[1:9]] for row in ids])
+        self._comp_prob = (comp_pct[:, None] + catch_pct)/2
+        # TEMP: Reduce ADOT for RB targets
+        self._ay_adjust = np.where(np.isin(names[:, 1:9], rbs), -5, 1)
+        self._ol_ybc = np.array([OL_YBC[team] for team in self._teams])
+        self._punt_return = np.array([PUNT_RETURNERS[team] for team in self._teams])
+
+    def variant(self, changes:dict[str, dict[str, str]]) -> "Monte_Carlo_Sim":
+        """Copy of the model with some teams' rosters or coaches changed.
+
+        Teams whose players changed are rebuilt, every other team is shared with
+        this model, so a variant is cheap to make. The variant has its own
+        model_hash (its cached results never mix with this model's) and its own
+        worker pool.
+
+        Typical usage example:
+
+            backup = sim.variant({"PHI":{"qb":"Tanner McKee"}})
+            new_coach = sim.variant({"DAL":{"coach":"Andy Reid"}})
+
+        Args:
+            changes: {team: {teams.csv column: new value}}, e.g. a player for a
+                roster position or a coach with a playcall profile
+
+        Returns:
+            A new Monte_Carlo_Sim, this model is left unchanged.
+        """
+        for team, columns in changes.items():
+            if team not in self._team_codes:
+                raise ValueError("Unknown team: {}".format(team))
+            unknown = set(columns) - set(ROSTER_POSITIONS) - {"coach"}
+            if unknown:
+                raise ValueError("Unknown roster columns: {}".format(", ".join(sorted(unknown))))
+            if "coach" in columns and columns["coach"] not in set(self._playcall_profiles["coach"]):
+                raise ValueError("No playcall profile for coach {}".format(columns["coach"]))
+            players = [player for column, player in columns.items() if column != "coach"]
+            missing = [player for player in players if player not in self.__id_dict]
+            if missing:
+                raise ValueError("Unknown players: {}".format(", ".join(missing)))
+        variant = Monte_Carlo_Sim.__new__(Monte_Carlo_Sim)
+        variant.__setstate__(self.__getstate__())
+        variant.cluster = None
+        rebuilt = [team for team, columns in changes.items() if set(columns) - {"coach"}]
+        if rebuilt and "_fg_data" not in variant.__dict__:
+            # Rebuilt teams are fit from ./data (reloading it resets the rosters)
+            variant.load_data()
+        rosters = variant._team_rosters.copy()
+        for team, columns in changes.items():
+            for column, value in columns.items():
+                rosters.loc[rosters["team"] == team, column] = value
+        variant._team_rosters = rosters
+        variant.compile_tables()
+        variant._team_blobs = {team:blob for team, blob in self._team_blobs.items() if team not in rebuilt}
+        for team in rebuilt:
+            # Workers unpickle the rebuilt teams instead of fitting them again
+            variant.build_teams(team)
+            variant._team_blobs[team] = pickle.dumps(variant._team_models[team], protocol=pickle.HIGHEST_PROTOCOL)
+        variant.model_hash = hashlib.sha256((self.model_hash + json.dumps(changes, sort_keys=True)).encode()).hexdigest()
+        return variant
+
+    def __empty_teams(self) -> dict:
+        # Per-team state before any team is built
+        return {"_team_models":{}, "_dists":{dist_type:{} for dist_type in ID_KEYS},
+                "_quantile_tables":{dist_type:{} for dist_type in ID_KEYS},
+                "_rusher_table":[None]*len(self._teams), "_target_table":[None]*len(self._teams),
+                "_passer_table":[None]*len(self._teams), "_punter_table":[None]*len(self._teams),
+                "_kicker_table":np.full((len(self._teams), len(FG_YARDLINES)), np.nan),
+                "_rush_def_table":[None]*len(self._teams), "_pass_def_table":[None]*len(self._teams)}
+
+    def build_teams(self, *teams:str):
+        """Build the distributions and tables of teams that are not built yet.
+
+        A matchup only needs its two teams, so each team is built the first
+        time one of its games is simulated and memoized. Teams come from the
+        pickled per-team blobs of the artifact when there are any (see
+        pack_teams()), and are otherwise fit and compiled from ./data. Safe to
+        call from several threads at once.
+
+        Args:
+            teams: Team abbreviations
+        """
+        missing = [team for team in teams if team not in self._team_models]
+        if not missing:
+            return
+        with _BUILD_LOCK:
+            for team in missing:
+                if team in self._team_models:
+                    # Built by another thread while waiting for the lock
+                    continue
+                blob = self._team_blobs.get(team)
+                self.__install_team(team, pickle.loads(blob) if blob is not None else self.__compile_team(team))
+
+    def pack_teams(self):
+        # Build every team and keep a pickled copy of each for the artifact and workers
+        self.build_teams(*self._teams)
+        self._team_blobs = {team:pickle.dumps(self._team_models[team], protocol=pickle.HIGHEST_PROTOCOL)
+                            for team in self._teams}
+
+    def __compile_team(self, team:str) -> dict:
+        # Fit the distributions of one team's players, defense and kicker, and
+        # compile them to quantile tables (see validate_quantile_tables())
+        if "_fg_data" not in self.__dict__:
+            self.load_data()
+        row = self._team_rosters[self._team_rosters["team"] == team].iloc[0]
+        # Use "League Average" id if player is missing their gsis id
+        ids = ["LA" if isinstance(id, float) else id for id in self.get_ids(row[ROSTER_POSITIONS].tolist())]
+        entities = {"rb":ids[0:3], "yac":ids[1:9], "ay":ids[0:1], "punt":[ids[PUNTER]],
+                    "rush_def":[team], "pass_def":[team]}
+        dists = {dist_type:{} for dist_type in entities}
+        tables = {dist_type:{} for dist_type in entities}
+        for dist_type, type_ids in entities.items():
+            for id in type_ids:
+                # Players already built for another team are reused
+                dist = self._dists[dist_type].get(id)
+                dists[dist_type][id] = dist if dist is not None else self.build_yardage_distribution(dist_type, id)
+                table = self._quantile_tables[dist_type].get(id)
+                tables[dist_type][id] = table if table is not None else QuantileTable.from_dist(dists[dist_type][id])
+        return {"ids":ids, "dists":dists, "tables":tables, "fg_table":self.fit_fg_model(ids[KICKER])[1]}
+
+    def __install_team(self, team:str, model:dict):
+        t = self._team_codes[team]
+        for dist_type in model["dists"]:
+            self._dists[dist_type].update(model["dists"][dist_type])
+            self._quantile_tables[dist_type].update(model["tables"][dist_type])
+        ids, tables = model["ids"], self._quantile_tables
+        self._rusher_table[t] = [tables["rb"][id] for id in ids[0:3]]
+        self._target_table[t] = [tables["yac"][id] for id in ids[1:9]]
+        self._passer_table[t] = tables["ay"][ids[0]]
+        self._kicker_table[t] = model["fg_table"]
+        self._punter_table[t] = tables["punt"][ids[PUNTER]]
+        self._rush_def_table[t] = tables["rush_def"][team]
+        self._pass_def_table[t] = tables["pass_def"][team]
+        # Marks the team as built, so only once every table is in place
+        self._team_models[team] = model
+
+    def validate_quantile_tables(self) -> dict[str, dict[str, float]]:
+        """Worst accuracy of the compiled quantile tables against their scipy fits.
+
+        Returns:
+            For each distribution type ("rb", "yac", ...), the largest ks,
+            mean_error and std_error (see QuantileTable.validate()) over all
+            of that type's tables. Fits with infinite variance are left out of
+            std_error.
+        """
+        self.build_teams(*self._teams)
+        worst = dict()
+        for dist_type, dists in self._dists.items():
+            errors = [self._quantile_tables[dist_type][id].validate(dist) for id, dist in dists.items()]
+            worst[dist_type] = {key:float(np.nanmax([error[key] for error in errors])) for key in errors[0]}
+        return worst
+
+    def rush_yds(self, state:GameState) -> tuple[float, int]:
+        # Pick QB, RB1 or RB2 based on snap counts, returning yards and the rusher's player code
+        prob, alias = self._rusher_alias
+        slot = alias_draw(prob[state.pos_team], alias[state.pos_team], state.rng.random())
+        rb = self._roster_table[state.pos_team, slot]
         # Based on RB, OL, Def distributions, randomly sample and return rush yards on a given play
-        rb_yac = self._rb_dists[rb_id].rvs(1)[0]
-        def_yards = self._rush_def_dists[self.__def_team].rvs(1)[0]
+        rb_yac = self.__draw(state, self._rusher_table[state.pos_team][slot])
+        def_yards = self.__draw(state, self._rush_def_table[state.def_team])
         # Weighting factors (Temporarily removed OL contribution)
         lambda_rb, lambda_ol, lambda_def = 1, 0, 1
-        # Offensive line yards before contact for 2024
-        ol_ybc = {"ATL":2.2,"BUF":2.5,"CAR":2.7,"CHI":2.5,"CIN":2.7,"CLE":2.5,
-                  "IND":2.9,"ARI":3.0,"DAL":2.1,"DEN":2.4,"DET":2.6,"GB":2.4,
-                  "HOU":2.4,"JAX":2.0,"KC":2.4,"MIA":2.3,"MIN":2.3,"NO":2.5,
-                  "NE":2.4,"NYG":2.5,"NYJ":2.1,"TEN":2.1,"PIT":2.2,"PHI":3.2,
-                  "LV":1.9,"LAR":2.2,"BAL":3.3,"LAC":2.0,"SEA":2.4,"SF":2.7,
-                  "TB":2.8,"WAS":2.9}
-        return (lambda_rb*rb_yac + lambda_def*def_yards + lambda_ol*ol_ybc[self.__pos_team]) / (lambda_rb+lambda_ol+lambda_def), rb
+        return (lambda_rb*rb_yac + lambda_def*def_yards + lambda_ol*self._ol_ybc[state.pos_team]) / (lambda_rb+lambda_ol+lambda_def), rb
     
-    def pass_yds(self, stats:dict) -> tuple[float, str, str, dict]:
-        # Based on QB, WR, Def distributions, randomly sample and return pass yards on a given play
-        qb = self._team_rosters[self._team_rosters["team"] == self.__pos_team]["qb"].iloc[0]
-        qb_id = self.get_ids([qb])[0]
+    def pass_yds(self, state:GameState) -> tuple[float, int, int]:
+        # Based on QB, WR, Def distributions, randomly sample and return pass yards
+        # on a given play, with the target's and QB's player codes
+        qb = self._roster_table[state.pos_team, 0]
         # Choose target based on target_pct
-        targets = self._team_rosters[self._team_rosters["team"] == self.__pos_team].iloc[0,3:11]
-        target = self.__rng.choice(targets, 1, p=list(self._target_rates[self.__pos_team].values()))[0]
-        target_id = self.get_ids([target])[0]
+        prob, alias = self._target_alias
+        slot = alias_draw(prob[state.pos_team], alias[state.pos_team], state.rng.random())
+        target = self._roster_table[state.pos_team, slot+1]
         # Check QB & Defense for interception
-        int_pct = self._int_rate.get(qb_id, np.mean(list(self._int_rate.values())))
-        def_int_pct = self._def_ints[self.__def_team]
-        if self.__rng.uniform() < ((int_pct + def_int_pct)/2):
-            stats["ints"][qb] = stats["ints"].get(qb, 0) + 1
-            air_yards = self._ay_dists[qb_id].rvs(1)[0]
+        if state.rng.uniform() < self._int_prob[state.pos_team, state.def_team]:
+            state.stats[state.rows[qb] + INTS] += 1
+            air_yards = self.__draw(state, self._passer_table[state.pos_team])
             # ~40% of interception returns are 0 yards, currently assuming all returns are 0 yards
-            self.__yardline -= air_yards
-            self.__turnover(downs=False, score=False)
-            return 0, target, qb, stats
-        # Calculate weighted completion pct (qb_cmp_pct, catch_pct)
-        # Use league averages for rookies
-        comp_pct = self._comp_pct.get(qb_id, np.mean(list(self._comp_pct.values())))
-        catch_pct = self._catch_pct.get(target_id, np.mean(list(self._catch_pct.values())))
-        if self.__rng.uniform() < ((comp_pct + catch_pct)/2):
-            stats["rec"][target] = stats["rec"].get(target,0) + 1
+            state.yardline -= air_yards
+            self.__turnover(state, downs=False, score=False)
+            return 0, target, qb
+        # Weighted completion pct (qb_cmp_pct, catch_pct)
+        if state.rng.uniform() < self._comp_prob[state.pos_team, slot]:
+            state.stats[state.rows[target] + REC] += 1
             # If complete, sample from yardage distributions
-            air_yards = self._ay_dists[qb_id].rvs(1)[0]
-            # TEMP: Reduce ADOT for RB targets
-            air_yards = air_yards - 5 if target in self._team_rosters[["rb_1","rb_2"]].to_numpy() else air_yards + 1
-            yac = min(self._yac_dists[target_id].rvs(1)[0],100) #Cap YAC distributions to 100 yards
-            def_yards = self._pass_def_dists[self.__def_team].rvs(1)[0]
+            air_yards = self.__draw(state, self._passer_table[state.pos_team]) + self._ay_adjust[state.pos_team, slot]
+            yac = min(self.__draw(state, self._target_table[state.pos_team][slot]),100) #Cap YAC distributions to 100 yards
+            def_yards = self.__draw(state, self._pass_def_table[state.def_team])
             lambda_ay, lambda_yac, lambda_def = 1, 1, 1
-            return (lambda_ay*air_yards + lambda_yac*yac + lambda_def*def_yards) / (0.5*lambda_ay+0.5*lambda_yac+lambda_def), target, qb, stats
+            return (lambda_ay*air_yards + lambda_yac*yac + lambda_def*def_yards) / (0.5*lambda_ay+0.5*lambda_yac+lambda_def), target, qb
         # Else netyards = 0
-        return 0, target, qb, stats
-
-    def field_goal_attempt(self) -> tuple[bool, str]:
-        kicker = self._team_rosters[self._team_rosters["team"] == self.__pos_team]["kicker"].iloc[0]
-        kicker_id = self.get_ids([kicker])[0]
-        fg_model = self._fg_dists[kicker_id]
-        make_prob = fg_model.predict_proba(np.array([[self.__yardline]]))[0,0]
-        return make_prob >= self.__rng.uniform(), kicker
+        return 0, target, qb
+
+    def field_goal_attempt(self, state:GameState) -> tuple[bool, int]:
+        kicker = self._roster_table[state.pos_team, KICKER]
+        # Interpolate the kicker's tabulated make probability (exact at integer yardlines)
+        make_prob = np.interp(state.yardline, FG_YARDLINES, self._kicker_table[state.pos_team])
+        return make_prob >= state.rng.uniform(), kicker
     
-    def punt(self) -> float:
-        punter = self._team_rosters[self._team_rosters["team"] == self.__pos_team]["punter"].iloc[0]
-        punter_id = self.get_ids([punter])[0]
-        punt_dist = self._punt_dists[punter_id]
+    def punt(self, state:GameState) -> float:
+        punt_dist = self._punter_table[state.pos_team]
         # Weighting factors
         lambda_pr = 1
         lambda_pay = 1
-        # Punt Returner projections from Mike Clay: https://g.espncdn.com/s/ffldraftkit/25/NFLDK2025_CS_ClayProjections2025.pdf?adddata=2025CS_ClayProjections2025
-        punt_returners = {"ATL":258/27,"BUF":317/28,"CAR":231/27,"CHI":257/29,
-                          "CIN":259/27,"CLE":252/27,"IND":283/28,"ARI":272/28,
-                          "DAL":276/27,"DEN":443/29,"DET":410/31,"GB":258/29,
-                          "HOU":290/30,"JAX":259/27,"KC":266/28,"MIA":214/28,
-                          "MIN":284/30,"NO":258/27,"NE":437/29,"NYG":228/29,
-                          "NYJ":230/29,"TEN":252/27,"PIT":317/30,"PHI":247/28,
-                          "LV":258/27,"LAR":264/28,"BAL":288/30,"LAC":336/27,
-                          "SEA":206/30,"SF":237/27,"TB":235/28,"WAS":243/25}
-        punt_yards = punt_dist.rvs(1)[0]
-        return (lambda_pr*punt_returners[self.__def_team]+lambda_pay*punt_yards)/(lambda_pr+lambda_pay)
+        punt_yards = self.__draw(state, punt_dist)
+        return (lambda_pr*self._punt_return[state.def_team]+lambda_pay*punt_yards)/(lambda_pr+lambda_pay)
     
-    def __turnover(self, downs:int, score:bool):
-        self.__down = 1 if downs else 0
-        self.__distance = 10
-        self.__yardline = 65 if score else 100 - self.__yardline
-        self.__pos_team, self.__def_team = self.__def_team, self.__pos_team
-
-    def run_simulations(self, home:str, away:str, n:int, verbose=False, progress = None):
-        # Simulate n games between two teams, returning summary statistics
+    def __turnover(self, state:GameState, downs:int, score:bool):
+        state.down = 1 if downs else 0
+        state.distance = 10
+        state.yardline = 65 if score else 100 - state.yardline
+        state.pos_team, state.def_team = state.def_team, state.pos_team
+
+    def run_simulations(self, home:str, away:str, n:int, verbose=False, progress = None,
+                        engine="game", seed:int|None=None):
+        # Simulate n games between two teams, returning summary statistics.
+        # A seed makes the run reproducible (see SEED_BLOCKS)
         home_scores, away_scores, stats = [], [], []
-        stat_names = ["pass_yards","pass_tds","ints","rush_yards","rush_tds",
-                      "rec", "rec_yards", "rec_tds"]
-        self.sim_stats = {stat:defaultdict(list) for stat in stat_names}
-        self.verbose = verbose
+        self.sim_stats = {stat:defaultdict(list) for stat in STAT_NAMES}
+        players = self.matchup_players(home, away)
+        if engine != "game":
+            # Vectorized engine simulates every game at once (no per-game progress)
+            home_results, away_results, batch_stats = self.simulate(home, away, n, engine, seed)
+            self.store_batch_stats(self.matchup_players(home, away), batch_stats)
+            return home_results.tolist(), away_results.tolist()
+        rng = None
         for game in tqdm(range(n)):
-            home_score, away_score, game_stats = self.sim_game(home, away)
+            if seed is not None and game % SEED_BLOCKS[engine] == 0:
+                rng = stream_rng(seed, game // SEED_BLOCKS[engine])
+                self.seed_pools(rng)
+            home_score, away_score, game_stats = self.sim_game(home, away, rng, verbose=verbose)
             home_scores.append(home_score)
             away_scores.append(away_score)
             stats.append(game_stats)
             if progress is not None:
                 progress.set(game, message="Simulating Games")
-        self.update_player_stats(stats)
+        if seed is not None:
+            self.seed_pools(None)
+        self.store_batch_stats(players, np.array(stats).reshape(n, len(players), len(STAT_NAMES)))
         return home_scores, away_scores
     
     def parallel_sim(self, home:str, away:str, n:int, cpu_count:int, 
-                     verbose=False, progress = None) -> tuple[list, list]:
+                     verbose=False, progress = None, engine="game",
+                     batch_size:int|None=None, seed:int|None=None, cache=None) -> tuple[list, list]:
         """Simulates n NFL games in parallel.
+
+        Games are split into batches which are simulated by a persistent pool of
+        worker processes (see worker_pool()). Each worker gets the model once
+        and returns compact score/stat arrays per batch.
         
         Args:
             home: String team name abbreviation for home team
@@ -275,134 +821,609 @@ class Monte_Carlo_Sim:
             cpu_count: Integer number of cores to split simulations across
             verbose: Boolean controlling whether play results should be printed
             progress: Shiny UI object for displaying simulation progress
+            engine: "game" (sim_game) or "batch" (sim_batch)
+            batch_size: Integer number of games per task (default splits n into
+                about 4 tasks per core)
+            seed: Integer seed for a reproducible run. Results for a given
+                (seed, n, engine) are identical for any cpu_count or batch_size.
+            cache: ResultCache for seeded runs. Cached games are reused and only
+                the games missing from the cache are simulated.
         
         Returns:
             Two lists, containing final scores for the home and away teams 
             respectively. Player stats are updated and stored in sim_stats.
 
         """
-        stat_names = ["pass_yards","pass_tds","ints","rush_yards","rush_tds",
-                      "rec", "rec_yards", "rec_tds"]
-        self.sim_stats = {stat:defaultdict(list) for stat in stat_names}
-        self.verbose = verbose
-        with Pool(cpu_count) as pool:
-            results = list()
-            i = 0
-            for result in pool.istarmap(self.sim_game, zip([home]*n, [away]*n)): #type: ignore
-                i += 1
+        self.sim_stats = {stat:defaultdict(list) for stat in STAT_NAMES}
+        results = list()
+        i = 0
+        for result in self.iter_sim(home, away, n, cpu_count, verbose, engine, batch_size, seed, cache):
+            i += len(result[0])
+            results.append(result)
+            if progress is not None:
+                progress.set(i, message="Simulating Games")
+        home_scores, away_scores, stats = (np.concatenate(arrays) for arrays in zip(*results))
+        self.store_batch_stats(self.matchup_players(home, away), stats)
+        return home_scores.tolist(), away_scores.tolist()
+
+    def iter_sim(self, home:str, away:str, n:int, cpu_count:int, verbose=False, engine="game",
+                 batch_size:int|None=None, seed:int|None=None, cache=None):
+        """Simulates n NFL games in parallel, yielding batches as they complete.
+
+        The generator behind parallel_sim(). Batches are submitted lazily, two
+        per core, so closing the generator early (e.g. to cancel a run) stops
+        the run after at most the batches already queued. Unlike parallel_sim()
+        it leaves sim_stats untouched, so runs can be streamed from a
+        background thread.
+
+        Args:
+            See parallel_sim().
+
+        Yields:
+            (home_scores, away_scores, stats) arrays for each batch in game
+            order, as returned by simulate(). Games served from the cache come
+            first, as one batch.
+        """
+        cached, first, cached_n = self.__cached_games(home, away, n, engine, seed, cache)
+        if cached is not None:
+            yield cached
+        tasks = self.__batch_tasks(home, away, n, cpu_count, engine, verbose, batch_size, seed, first)
+        if not tasks:
+            return
+        # The run is only kept when it is written to the cache
+        store = cache is not None and seed is not None and n > cached_n
+        results = [cached] if cached is not None else []
+        for result in self.__iwindow(cpu_count, _sim_task, tasks):
+            if store:
                 results.append(result)
-                if progress is not None:
-                    progress.set(i, message="Simulating Games")
-            home_scores, away_scores, stats = zip(*results) #Unpack list of tuples into two lists
-        self.update_player_stats(list(stats))
-        return list(home_scores), list(away_scores)
-    
-    def update_player_stats(self, stats:list[dict]):
-        for game in stats:
-            for stat, players in game.items():
-                for player in players:
-                    self.sim_stats[stat][player].append(game[stat][player])
+            yield result
+        if store:
+            cache.put(home, away, self.results_hash, seed, engine, self.matchup_players(home, away),
+                      STAT_NAMES, *(np.concatenate(arrays) for arrays in zip(*results)))
+
+    def summarize_sim(self, home:str, away:str, n:int, cpu_count:int, progress = None,
+                      engine="game", batch_size:int|None=None, seed:int|None=None) -> SimSummary:
+        """Simulates n NFL games in parallel, keeping only streaming summaries.
+
+        Like parallel_sim(), but each worker reduces its batch to a SimSummary
+        (running moments, histograms and quantiles per player stat and score)
+        which are merged as they arrive. Memory is constant in n, so this is the
+        mode for very large runs; parallel_sim() keeps every raw per-game value.
+
+        Args:
+            home: String team name abbreviation for home team
+            away: String team name abbreviation for away team
+            n: Integer number of games to simulate (>0)
+            cpu_count: Integer number of cores to split simulations across
+            progress: Shiny UI object for displaying simulation progress
+            engine: "game" (sim_game) or "batch" (sim_batch)
+            batch_size: Integer number of games per task (default splits n into
+                about 4 tasks per core, up to MAX_BATCH_SIZE)
+            seed: Integer seed for a reproducible run (see parallel_sim())
+
+        Returns:
+            SimSummary of all n games.
+        """
+        summary = SimSummary(self.matchup_players(home, away), STAT_NAMES)
+        tasks = self.__batch_tasks(home, away, n, cpu_count, engine, False, batch_size, seed)
+        for result in self.__imap(cpu_count, _summary_task, tasks):
+            summary.merge(result)
+            if progress is not None:
+                progress.set(summary.n, message="Simulating Games")
+        return summary
+
+    def precision_sim(self, home:str, away:str, cpu_count:int, target_se:float, target="spread",
+                      min_n:int=1000, max_n:int=100000, progress = None, engine="game",
+                      batch_size:int|None=None, seed:int|None=None) -> SimSummary:
+        """Simulates games until an estimate reaches a target standard error.
+
+        Batches are kept queued on the worker pool and merged in order. After
+        each batch the standard error of the target estimate is checked and the
+        run stops as soon as it is at most target_se (and at least min_n games
+        have been simulated), so stable estimates such as the mean spread need
+        far fewer games than a fixed n, while tail player stats get more.
+        Batches still queued when the run stops are discarded.
+
+        Args:
+            home: String team name abbreviation for home team
+            away: String team name abbreviation for away team
+            cpu_count: Integer number of cores to split simulations across
+            target_se: Standard error to stop at
+            target: Estimate to converge, see SimSummary.standard_error() ("spread",
+                "win_prob" or a (stat, player) tuple)
+            min_n: Minimum number of games before the standard error is trusted
+            max_n: Maximum number of games to simulate
+            progress: Shiny UI object for displaying simulation progress
+            engine: "game" (sim_game) or "batch" (sim_batch)
+            batch_size: Integer number of games between checks (default is
+                SEED_BLOCKS[engine])
+            seed: Integer seed for a reproducible run. The games used, and so
+                the number of games, only depend on (seed, engine, batch_size).
+
+        Returns:
+            SimSummary of the games used, its n is the number of games the
+            target needed (max_n if it was not reached).
+        """
+        block = SEED_BLOCKS[engine]
+        batch_size = batch_size or block
+        if seed is not None:
+            batch_size = -(-batch_size // block) * block
+        summary = SimSummary(self.matchup_players(home, away), STAT_NAMES)
+        tasks = ((home, away, min(batch_size, max_n-start), engine, False, seed, start)
+                 for start in range(0, max_n, batch_size))
+        for result in self.__iwindow(cpu_count, _summary_task, tasks):
+            summary.merge(result)
+            if progress is not None:
+                progress.set(summary.n, message="Simulating Games")
+            if summary.n >= min_n and summary.standard_error(target) <= target_se:
+                break
+        return summary
+
+    def iter_matchups(self, matchups:list[tuple[str, str]], n:int, cpu_count:int,
+                      engine="game", batch_size:int|None=None, seed:int|None=None, cache=None):
+        """Simulates n games of every matchup on one shared work queue.
+
+        All (matchup, batch) work units are queued at once and drained by the
+        persistent worker pool, so cores stay busy across matchup boundaries
+        instead of idling while the last batches of one matchup finish. Batch
+        summaries are merged per matchup as they arrive.
+
+        Args:
+            matchups: List of (home, away) team abbreviation tuples
+            n: Integer number of games to simulate per matchup (>0)
+            cpu_count: Integer number of cores to split simulations across
+            engine: "game" (sim_game) or "batch" (sim_batch)
+            batch_size: Integer number of games per task (default targets about
+                16 tasks per core over the whole job, up to MAX_BATCH_SIZE)
+            seed: Integer seed for a reproducible run, shared by every matchup
+                (see parallel_sim())
+            cache: ResultCache for seeded runs (see parallel_sim()). Fully cached
+                matchups are yielded first, without using the worker pool.
+
+        Yields:
+            (index, SimSummary) tuples as each matchup completes, where index is
+            the matchup's position in matchups.
+        """
+        if batch_size is None:
+            batch_size = min(max(1, -(-n*len(matchups) // (16*cpu_count))), n, MAX_BATCH_SIZE)
+        tasks = list()
+        # Raw (first game, arrays) batches of each matchup, needed to extend the cache
+        batches = defaultdict(list)
+        cached_sizes = dict()
+        for i, (home, away) in enumerate(matchups):
+            cached, first, cached_sizes[i] = self.__cached_games(home, away, n, engine, seed, cache)
+            if first == n:
+                yield i, self.__summarize(home, away, cached)
+                continue
+            if cached is not None:
+                batches[i].append((0, cached))
+            tasks += [(i, task) for task in
+                      self.__batch_tasks(home, away, n, cpu_count, engine, False, batch_size, seed, first)]
+        if not tasks:
+            return
+        if cache is None or seed is None:
+            summaries = {}
+            for i, result in self.__imap(cpu_count, _keyed_summary_task, tasks, ordered=False):
+                summary = summaries[i].merge(result) if i in summaries else result
+                summaries[i] = summary
+                if summary.n == n:
+                    yield i, summaries.pop(i)
+            return
+        for i, start, result in self.__imap(cpu_count, _keyed_sim_task, tasks, ordered=False):
+            batches[i].append((start, result))
+            if sum(len(arrays[0]) for _, arrays in batches[i]) == n:
+                home, away = matchups[i]
+                ordered = [arrays for _, arrays in sorted(batches.pop(i), key=lambda batch: batch[0])]
+                results = tuple(np.concatenate(arrays) for arrays in zip(*ordered))
+                if n > cached_sizes[i]:
+                    # Never replace a longer cached run
+                    cache.put(home, away, self.results_hash, seed, engine, self.matchup_players(home, away),
+                              STAT_NAMES, *results)
+                yield i, self.__summarize(home, away, results)
+
+    def sim_matchups(self, matchups:list[tuple[str, str]], n:int, cpu_count:int, engine="game",
+                     batch_size:int|None=None, seed:int|None=None, cache=None) -> list[SimSummary]:
+        # Collect iter_matchups() into a list of summaries in matchup order
+        summaries = dict(self.iter_matchups(matchups, n, cpu_count, engine, batch_size, seed, cache))
+        return [summaries[i] for i in range(len(matchups))]
+
+    def __summarize(self, home:str, away:str, results:tuple) -> SimSummary:
+        summary = SimSummary(self.matchup_players(home, away), STAT_NAMES)
+        summary.update(*results)
+        return summary
 
-    def sim_game(self, home:str, away:str) -> tuple[int, int, dict]:
+    def __cached_games(self, home:str, away:str, n:int, engine:str, seed:int|None,
+                       cache) -> tuple[tuple|None, int, int]:
+        # Up to n cached games of a seeded run, the index of the first game
+        # still to simulate and the number of games in the cache
+        if cache is None or seed is None:
+            return None, 0, 0
+        cached = cache.get(home, away, self.results_hash, seed, engine)
+        if cached is None:
+            return None, 0, 0
+        size = len(cached[0])
+        if size == n or (engine == "game" and size > n):
+            # A game engine game never depends on the games after it
+            first = n
+        else:
+            # The vectorized engines draw over a whole block at once, so a game
+            # depends on its block's length and only whole blocks are reused.
+            # Simulating the rest has to start on a random stream boundary.
+            first = min(n, size) // SEED_BLOCKS[engine] * SEED_BLOCKS[engine]
+        if first == 0:
+            return None, 0, size
+        return tuple(array[:first] for array in cached), first, size
+
+    def __batch_tasks(self, home:str, away:str, n:int, cpu_count:int, engine:str, verbose:bool,
+                      batch_size:int|None, seed:int|None=None, first:int=0) -> list[tuple]:
+        # Split games first to n into worker tasks
+        batch_size = batch_size or min(max(1, -(-(n-first) // (4*cpu_count))), MAX_BATCH_SIZE)
+        if seed is not None:
+            # Seeded tasks must start on a random stream boundary
+            block = SEED_BLOCKS[engine]
+            batch_size = -(-batch_size // block) * block
+        return [(home, away, min(batch_size, n-start), engine, verbose, seed, start)
+                for start in range(first, n, batch_size)]
+
+    def simulate(self, home:str, away:str, n:int, engine="game", seed:int|None=None,
+                 start:int=0, verbose=False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Simulate n games with either engine, returning sim_batch() style arrays.
+
+        Args:
+            home: String team name abbreviation for home team
+            away: String team name abbreviation for away team
+            n: Integer number of games to simulate (>0)
+            engine: "game" (sim_game, one game at a time), "batch" (sim_batch)
+                or "common" (sim_batch with common random numbers)
+            seed: Integer seed for a reproducible run
+            start: Index of the first game within the seeded run, a multiple of
+                SEED_BLOCKS[engine]
+            verbose: Boolean controlling whether play results should be printed
+                (game engine only)
+
+        Returns:
+            Home scores, away scores and a (n, players, stats) stat array, as
+            described in sim_batch().
+        """
+        if seed is not None:
+            # Simulate each random stream's block of games on its own generator
+            block = SEED_BLOCKS[engine]
+            if start % block:
+                raise ValueError("Seeded runs must start on a multiple of {0:n} games".format(block))
+            results = [self.__simulate_block(home, away, min(block, n-offset), engine,
+                                             stream_rng(seed, (start+offset) // block), verbose)
+                       for offset in range(0, n, block)]
+            return tuple(np.concatenate(arrays) for arrays in zip(*results))
+        return self.__simulate_block(home, away, n, engine, None, verbose)
+
+    def __simulate_block(self, home:str, away:str, n:int, engine:str, rng:np.random.Generator|None,
+                         verbose:bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if engine != "game":
+            return self.sim_batch(home, away, n, rng, common=engine == "common")
+        # A seeded block refills its own variate pools from its stream
+        pools = {} if rng is not None else None
+        players = self.matchup_players(home, away)
+        scores = np.zeros((n, 2), dtype=int)
+        stats = np.zeros((n, len(players), len(STAT_NAMES)))
+        for game in range(n):
+            scores[game, 0], scores[game, 1], stats[game] = self.sim_game(home, away, rng, pools, verbose)
+        return scores[:,0], scores[:,1], stats
+    
+    def sim_game(self, home:str, away:str, rng:np.random.Generator|None=None,
+                 pools:dict|None=None, verbose=False) -> tuple[int, int, np.ndarray]:
         """Stochastically simulate a single NFL game
         
         A simulated game consists of 124 total plays/snaps. A flowchart detailing 
         the logical flow of each simulated snap is included as "Sim_Game_Flowchart.jpg".
 
+        Everything that changes during the game is kept in a GameState local
+        to this call, so games can run concurrently on several threads sharing
+        one model.
+
         Args:
             home: String team name abbreviation for home team
             away: String team name abbreviation for away team
+            rng: numpy Generator for the game's playcalls and outcomes (default
+                is a fresh unseeded Generator)
+            pools: Variate pools to draw yardages from, refilled from rng and
+                reusable across the games of one stream (default is the calling
+                thread's pools, see seed_pools())
+            verbose: Boolean controlling whether play results should be printed
         
         Returns:
             Two integers representing the final score for the home and away team
-            respectively and a dictionary containing all of the player stats.
+            respectively and a (players, stats) array of the game's player stats,
+            where players follow matchup_players(home, away) and stats follow
+            STAT_NAMES.
 
         """
         
-        self._play_counts = {"pass":defaultdict(int),"run":defaultdict(int),"field_goal":0,"punt":0}
-        self.__rng = np.random.default_rng()
+        self.build_teams(home, away)
+        rng = rng if rng is not None else np.random.default_rng()
+        if pools is None:
+            local = self.__thread_pools()
+            pools, pool_rng = local.pools, local.rng
+        else:
+            pool_rng = rng
         # Given two teams, simulate a single game and return both teams' scores
         total_snaps = 124 # Average number of offensive snaps per game
-        scores = {home:0, away:0}
-        stats = {"pass_yards":{},"pass_tds":{},"ints":{},"rush_yards":{},
-                 "rush_tds":{},"rec":{}, "rec_yards":{}, "rec_tds":{}}
-        self.__down, self.__distance, self.__yardline = 1, 10, 65
-        self.__pos_team = self.__rng.choice((home, away), 1)[0]
-        self.__def_team = home if self.__pos_team == away else away
+        # Teams are tracked by their integer codes in the compiled tables
+        home_code, away_code = self._team_codes[home], self._team_codes[away]
+        scores = {home_code:0, away_code:0}
+        # Players are mapped to accumulator rows once, in matchup_players() order
+        codes = self._roster_table[[home_code, away_code], :len(STAT_POSITIONS)].ravel().tolist()
+        rows = {code:i*len(STAT_NAMES) for i, code in enumerate(dict.fromkeys(codes))}
+        pos_team = rng.choice((home_code, away_code), 1)[0]
+        state = GameState(pos_team, home_code if pos_team == away_code else away_code, rng, pools, pool_rng, rows)
+        stats = state.stats
+        playcall_prob, playcall_alias = self._playcall_alias
+        # Phase timings are only taken when profiling
+        profiler = self.profiler
+        if profiler is not None:
+            game_start = perf_counter()
         for i in range(total_snaps):
-            if self.verbose:
-                print("Offense: {}".format(self.__pos_team))
+            if verbose:
+                print("Offense: {}".format(self._teams[state.pos_team]))
                 print("Down: {}, Distance: {:.0f} on the {:.0f} yardline".format(
-                    self.__down, self.__distance, self.__yardline))
+                    state.down, state.distance, state.yardline))
+            if profiler is not None:
+                snap_start = perf_counter()
             # Set relevant variables
-            redzone = self.__yardline <= 20
-            dist_type = self.__determine_dist_type(self.__down, self.__distance)
+            redzone = state.yardline <= 20
+            dist_type = self.__determine_dist_type(state.down, state.distance)
             # Get coach playcalling tendency for down and distance
-            pos_coach = self._team_rosters[self._team_rosters["team"] == self.__pos_team]["coach"].iloc[0]
-            tendencies = self._playcall_profiles.loc[(self._playcall_profiles["coach"]==pos_coach) & 
-                            (self._playcall_profiles["down"]==self.__down) & 
-                            (self._playcall_profiles["distance"] == dist_type) & 
-                            (self._playcall_profiles["red_zone"] == redzone), 
-                            ["pass_prob","run_prob","fg_prob","punt_prob"]].iloc[0]
-            play_type = self.__rng.choice(("pass","run","field_goal","punt"), 1, p=tendencies)[0]
+            cell = (state.pos_team, state.down, dist_type, int(redzone))
+            play_type = PLAY_TYPES[alias_draw(playcall_prob[cell], playcall_alias[cell], state.rng.random())]
+            if profiler is not None:
+                play_start = perf_counter()
+                profiler.add("playcall", play_start - snap_start)
             # Based on what play_type is chosen, run yardage function
             match play_type:
                 case "pass":
-                    net_yards, target, qb, stats = self.pass_yds(stats)
-                    net_yards = min(net_yards, self.__yardline+1) #cap yards by yardline
-                    self.__yardline -= net_yards
-                    self.__distance -= net_yards
-                    play_details = [net_yards,self.__yardline,target]
-                    stats["pass_yards"][qb] = stats["pass_yards"].get(qb, 0) + net_yards
-                    stats["rec_yards"][target] = stats["rec_yards"].get(target, 0) + net_yards
+                    net_yards, target, qb = self.pass_yds(state)
+                    net_yards = min(net_yards, state.yardline+1) #cap yards by yardline
+                    state.yardline -= net_yards
+                    state.distance -= net_yards
+                    play_details = [net_yards,state.yardline,target]
+                    stats[rows[qb] + PASS_YARDS] += net_yards
+                    stats[rows[target] + REC_YARDS] += net_yards
                 case "run":
-                    net_yards, rb = self.rush_yds()
-                    net_yards = min(net_yards, self.__yardline+1)
-                    self.__yardline -= net_yards
-                    self.__distance -= net_yards
-                    play_details = [net_yards, self.__yardline, rb]
-                    stats["rush_yards"][rb] = stats["rush_yards"].get(rb, 0) + net_yards
+                    net_yards, rb = self.rush_yds(state)
+                    net_yards = min(net_yards, state.yardline+1)
+                    state.yardline -= net_yards
+                    state.distance -= net_yards
+                    play_details = [net_yards, state.yardline, rb]
+                    stats[rows[rb] + RUSH_YARDS] += net_yards
                 case "field_goal":
-                    good, kicker = self.field_goal_attempt()
+                    good, kicker = self.field_goal_attempt(state)
                     if good:    
-                        scores[self.__pos_team] += 3
-                        self.__turnover(downs=False, score=True)
+                        scores[state.pos_team] += 3
+                        self.__turnover(state, downs=False, score=True)
                     else:
-                        self.__turnover(downs=False, score=False)
+                        self.__turnover(state, downs=False, score=False)
                     play_details = [good, kicker]
                 case "punt":
-                    net_yards = self.punt()
-                    self.__yardline -= net_yards if net_yards > 0 else 20
-                    self.__turnover(downs=False, score=False)
+                    net_yards = self.punt(state)
+                    state.yardline -= net_yards if net_yards > 0 else 20
+                    self.__turnover(state, downs=False, score=False)
+            if profiler is not None:
+                bookkeeping_start = perf_counter()
+                profiler.add(play_type, bookkeeping_start - play_start)
             # Update relevant variables (can happen inside the functions)
-            if self.__yardline < 0:
-                scores[self.__pos_team] += 7 # Assuming automatic extra point on every touchdown (fix later)
-                self.__turnover(downs=True, score=True)
+            if state.yardline < 0:
+                scores[state.pos_team] += 7 # Assuming automatic extra point on every touchdown (fix later)
+                self.__turnover(state, downs=True, score=True)
                 if play_type == "pass":
-                    stats["pass_tds"][qb] = stats["pass_tds"].get(qb, 0) + 1
-                    stats["rec_tds"][target] = stats["rec_tds"].get(target, 0) + 1
+                    stats[rows[qb] + PASS_TDS] += 1
+                    stats[rows[target] + REC_TDS] += 1
                 else:
-                    stats["rush_tds"][rb] = stats["rush_tds"].get(rb, 0) + 1
-            elif self.__down == 4 and self.__distance > 0:
+                    stats[rows[rb] + RUSH_TDS] += 1
+            elif state.down == 4 and state.distance > 0:
                 # Turnover on downs
-                self.__turnover(downs=True, score=False)
-            elif self.__distance <= 0:
+                self.__turnover(state, downs=True, score=False)
+            elif state.distance <= 0:
                 # First down
-                self.__down, self.__distance = 1, 10
+                state.down, state.distance = 1, 10
             else:
-                self.__down += 1
-            if self.verbose:
-                self.__print_play_type(play_type, play_details)
-        return scores[home], scores[away], stats
+                state.down += 1
+            if profiler is not None:
+                profiler.add("bookkeeping", perf_counter() - bookkeeping_start)
+            if verbose:
+                self.__print_play_type(state, play_type, play_details)
+        if profiler is not None:
+            profiler.add("game", perf_counter() - game_start)
+        return scores[home_code], scores[away_code], np.array(stats).reshape(len(rows), len(STAT_NAMES))
     
-    def export_stats(self, home:str, away:str, path="./results/", suffix="stats.csv"):
-        reformed_stats = {(stat, player): values for stat, players in self.sim_stats.items() for player, values in players.items()}
-        n = max(len(value) for value in reformed_stats.values())
-        fill = [0] * n
-        padded_stats = {player:stats[:n] + fill[len(stats):] for player, stats in reformed_stats.items()}
-        stat_df = pd.DataFrame(padded_stats)
-        game_str = path + home + "v" + away + suffix
-        stat_df.to_csv(game_str)
+    def matchup_players(self, home:str, away:str) -> list[str]:
+        """Players tracked in the stat axis of a matchup's batch results.
+
+        Home skill players come first followed by the away skill players, each
+        in STAT_POSITIONS roster order.
+        """
+        codes = self._roster_table[[self._team_codes[home], self._team_codes[away]], :len(STAT_POSITIONS)]
+        return list(dict.fromkeys(self._players[code] for code in codes.ravel()))
+
+    def store_batch_stats(self, players:list[str], stats:np.ndarray):
+        # Append per-game values from a (games, players, stats) array to sim_stats
+        for s, stat in enumerate(STAT_NAMES):
+            for p, player in enumerate(players):
+                if stats[:, p, s].any():
+                    self.sim_stats[stat][player].extend(stats[:, p, s].tolist())
+
+    def sim_batch(self, home:str, away:str, n:int, rng:np.random.Generator|None=None,
+                  common=False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Stochastically simulate n NFL games in lockstep
+
+        Vectorized counterpart of sim_game(). Down, distance, yardline, possession
+        and score are kept as arrays over all n games, which are advanced one snap
+        at a time. Every play type is resolved for all of the games that called it
+        at once, with one bulk draw per distribution, so the per-snap Python
+        overhead is shared by the whole batch. The game logic mirrors sim_game(),
+        which remains the reference implementation.
+
+        Args:
+            home: String team name abbreviation for home team
+            away: String team name abbreviation for away team
+            n: Integer number of games to simulate (>0)
+            rng: numpy Generator for every draw in the batch (default is a fresh
+                unseeded Generator)
+            common: Draw common random numbers. Every snap draws one uniform
+                per game for each decision in COMMON_DRAWS, used or not, and
+                every outcome is an inverse CDF of its uniform. Game i's k-th
+                snap then uses the same uniforms in any model, so two models
+                run with the same rng stay synchronized even after their plays
+                diverge (see scenarios.py). Costs about 20% more time.
+
+        Returns:
+            Two integer arrays of length n with the final home and away scores and
+            a (n, players, stats) array of per-game player stats, where players
+            follow matchup_players(home, away) and stats follow STAT_NAMES.
+
+        """
+        self.build_teams(home, away)
+        rng = rng if rng is not None else np.random.default_rng()
+        total_snaps = 124 # Average number of offensive snaps per game
+        # Map compiled player codes onto the matchup's stat axis
+        players = [self._player_codes[player] for player in self.matchup_players(home, away)]
+        local = np.full(len(self._players), -1)
+        local[players] = np.arange(len(players))
+        # Possession is tracked as a side (0 = home, 1 = away), codes maps sides to teams
+        codes = np.array([self._team_codes[home], self._team_codes[away]])
+        playcall_prob, playcall_alias = self._playcall_alias
+        rusher_prob, rusher_alias = self._rusher_alias
+        target_prob, target_alias = self._target_alias
+        stat = {name:i for i, name in enumerate(STAT_NAMES)}
+        stats = np.zeros((n, len(players), len(STAT_NAMES)))
+        scores = np.zeros((n, 2), dtype=int)
+        down = np.ones(n, dtype=int)
+        distance = np.full(n, 10.0)
+        yardline = np.full(n, 65.0)
+        pos = rng.integers(0, 2, n)
+        games = np.arange(n)
+        draws = {name:k for k, name in enumerate(COMMON_DRAWS)}
+        uniforms = None
+
+        def turnover(idx:np.ndarray, downs:bool, score:bool):
+            down[idx] = 1 if downs else 0
+            distance[idx] = 10
+            yardline[idx] = 65 if score else 100 - yardline[idx]
+            pos[idx] = 1 - pos[idx]
+
+        def uniform(name:str, idx:np.ndarray) -> np.ndarray:
+            # Uniforms for the games in idx, the snap's common ones if drawing them
+            return rng.random(len(idx)) if uniforms is None else uniforms[idx, draws[name]]
+
+        def sample(dist, name:str, idx:np.ndarray) -> np.ndarray:
+            if uniforms is None:
+                return dist.rvs(size=len(idx), random_state=rng)
+            return dist.ppf(uniforms[idx, draws[name]])
+
+        def draw(dists:list, choice:np.ndarray, name:str, idx:np.ndarray) -> np.ndarray:
+            # One bulk draw per distribution for the games that selected it
+            values = np.empty(len(choice))
+            for i, dist in enumerate(dists):
+                mask = choice == i
+                if mask.any():
+                    values[mask] = sample(dist, name, idx[mask])
+            return values
+
+        for i in range(total_snaps):
+            if common:
+                uniforms = rng.random((n, len(COMMON_DRAWS)))
+            # Playcall from the possessing coach's tendencies for down, distance and red zone
+            bucket = np.where(down == 1, 0, np.where(distance < 4, 1, np.where(distance > 6, 3, 2)))
+            cell = (codes[pos], down, bucket, (yardline <= 20).astype(int))
+            play_type = alias_sample(playcall_prob[cell], playcall_alias[cell], uniform("playcall", games))
+            net_yards = np.zeros(n)
+            # Player credited for a touchdown on this snap (-1 = none)
+            passer, receiver, rusher = np.full(n, -1), np.full(n, -1), np.full(n, -1)
+            # Possession at the snap (turnovers below flip pos mid-snap)
+            snap_pos = pos.copy()
+            for side in (0, 1):
+                offense = snap_pos == side
+                t, d = codes[side], codes[1-side]
+                # Pass
+                idx = games[offense & (play_type == 0)]
+                if len(idx):
+                    slot = alias_sample(target_prob[t], target_alias[t], uniform("target", idx))
+                    passer[idx] = local[self._roster_table[t, 0]]
+                    receiver[idx] = local[self._roster_table[t, slot+1]]
+                    intercepted = uniform("interception", idx) < self._int_prob[t, d]
+                    ints = idx[intercepted]
+                    if len(ints):
+                        stats[ints, passer[ints], stat["ints"]] += 1
+                        # ~40% of interception returns are 0 yards, currently assuming all returns are 0 yards
+                        yardline[ints] -= sample(self._passer_table[t], "int_return", ints)
+                        turnover(ints, downs=False, score=False)
+                    idx, slot = idx[~intercepted], slot[~intercepted]
+                    complete = uniform("completion", idx) < self._comp_prob[t, slot]
+                    idx, slot = idx[complete], slot[complete]
+                    if len(idx):
+                        stats[idx, receiver[idx], stat["rec"]] += 1
+                        air_yards = sample(self._passer_table[t], "air_yards", idx) + self._ay_adjust[t, slot]
+                        yac = np.minimum(draw(self._target_table[t], slot, "yac", idx), 100) #Cap YAC distributions to 100 yards
+                        def_yards = sample(self._pass_def_table[d], "pass_def", idx)
+                        net_yards[idx] = (air_yards + yac + def_yards) / 2
+                # Run
+                idx = games[offense & (play_type == 1)]
+                if len(idx):
+                    slot = alias_sample(rusher_prob[t], rusher_alias[t], uniform("rusher", idx))
+                    rusher[idx] = local[self._roster_table[t, slot]]
+                    rb_yac = draw(self._rusher_table[t], slot, "rush_yards", idx)
+                    def_yards = sample(self._rush_def_table[d], "rush_def", idx)
+                    net_yards[idx] = (rb_yac + def_yards) / 2
+                # Field Goal
+                idx = games[offense & (play_type == 2)]
+                if len(idx):
+                    make_prob = np.interp(yardline[idx], FG_YARDLINES, self._kicker_table[t])
+                    good = make_prob >= uniform("field_goal", idx)
+                    scores[idx[good], side] += 3
+                    turnover(idx[good], downs=False, score=True)
+                    turnover(idx[~good], downs=False, score=False)
+                # Punt
+                idx = games[offense & (play_type == 3)]
+                if len(idx):
+                    punt_yards = sample(self._punter_table[t], "punt", idx)
+                    punt_net = (self._punt_return[d] + punt_yards) / 2
+                    yardline[idx] -= np.where(punt_net > 0, punt_net, 20)
+                    turnover(idx, downs=False, score=False)
+            # Advance the ball for scrimmage plays (intercepted/incomplete passes gain 0)
+            idx = games[play_type < 2]
+            net_yards[idx] = np.minimum(net_yards[idx], yardline[idx]+1) #cap yards by yardline
+            yardline[idx] -= net_yards[idx]
+            distance[idx] -= net_yards[idx]
+            passes = idx[passer[idx] >= 0]
+            stats[passes, passer[passes], stat["pass_yards"]] += net_yards[passes]
+            stats[passes, receiver[passes], stat["rec_yards"]] += net_yards[passes]
+            runs = idx[rusher[idx] >= 0]
+            stats[runs, rusher[runs], stat["rush_yards"]] += net_yards[runs]
+            # Touchdowns, turnovers on downs, first downs and down progression
+            touchdown = yardline < 0
+            on_downs = ~touchdown & (down == 4) & (distance > 0)
+            first_down = ~touchdown & ~on_downs & (distance <= 0)
+            next_down = ~touchdown & ~on_downs & ~first_down
+            idx = games[touchdown]
+            scores[idx, pos[idx]] += 7 # Assuming automatic extra point on every touchdown (fix later)
+            passes, runs = idx[passer[idx] >= 0], idx[rusher[idx] >= 0]
+            stats[passes, passer[passes], stat["pass_tds"]] += 1
+            stats[passes, receiver[passes], stat["rec_tds"]] += 1
+            stats[runs, rusher[runs], stat["rush_tds"]] += 1
+            turnover(idx, downs=True, score=True)
+            turnover(games[on_downs], downs=True, score=False)
+            down[first_down], distance[first_down] = 1, 10
+            down[next_down] += 1
+        return scores[:,0], scores[:,1], stats
+
+    def export_stats(self, home:str, away:str, path="./results/", home_scores=None, away_scores=None):
+        # Write sim_stats (zero padded to the longest stat list) and optionally the
+        # scores to a columnar results store at [path][home]v[away]
+        players = self.matchup_players(home, away)
+        n = max(len(values) for stat_players in self.sim_stats.values() for values in stat_players.values())
+        stats = np.zeros((n, len(players), len(STAT_NAMES)), dtype=np.float32)
+        for s, stat in enumerate(STAT_NAMES):
+            for player, values in self.sim_stats[stat].items():
+                stats[:len(values), players.index(player), s] = values
+        save_results(path + home + "v" + away, players, STAT_NAMES, stats, home_scores, away_scores)
 
 if __name__ == "__main__":
     freeze_support()
@@ -410,6 +1431,6 @@ if __name__ == "__main__":
     home, away = "CLE", "CIN"
     home_scores, away_scores = sim_test.parallel_sim(home, away, 100, 4)
     print("Simulation Results - {}: {:.2f}, {}: {:.2f}".format(home, np.mean(home_scores), away, np.mean(away_scores)))
-    '''sim_test.export_stats(home, away, suffix="stats_2.csv")
+    '''sim_test.export_stats(home, away)
     sim_test.run_simulations(home, away, 1, verbose=True)
     print(sim_test.sim_stats)'''
\ No newline at end of file
@@ -1,4 +1,6 @@
-from monte_carlo import Monte_Carlo_Sim
+from monte_carlo import Monte_Carlo_Sim, STAT_NAMES
+from fantasy import fantasy_points
+from result_cache import ResultCache
 import pandas as pd
 import numpy as np
 from collections import defaultdict
@@ -72,10 +74,16 @@ season = {1:[("PHI","DAL"),("LAC","KC"),("ATL","TB"),("CLE","CIN"),("IND","MIA")
 sim = Monte_Carlo_Sim()
 n = 100
 cpus = 10
+seed = 0
 
-def sim_season(sim:Monte_Carlo_Sim, season_games:dict, n:int, cpus:int, save_stats=True):
+def sim_season(sim:Monte_Carlo_Sim, season_games:dict, n:int, cpus:int, save_stats=True,
+               engine="game", seed:int|None=None, cache:ResultCache|None=None):
     """Function for simulating an entire NFL season's worth of games
     
+    Every matchup of every week is queued as one job on the sim's persistent
+    worker pool (see Monte_Carlo_Sim.iter_matchups), so all cores stay busy
+    for the whole season. Each matchup is reduced to its summary as it completes.
+
     Inputs:
         sim: Monte Carlo Sim object
         season_games: A dictionary containing the season's matchups
@@ -83,26 +91,25 @@ def sim_season(sim:Monte_Carlo_Sim, season_games:dict, n:int, cpus:int, save_sta
         n: Number of times to simulate each matchup (int)
         cpus: Number of cpus to use in parallel (int)
         save_stats: Boolean indicating whether or not to save stats in json files
+        engine: "game" (sim_game) or "batch" (sim_batch)
+        seed: Seed for a reproducible season (int)
+        cache: ResultCache reused across reruns of a seeded season
     """
     results = defaultdict(dict)
     stats = defaultdict(lambda: defaultdict(list))
-    
-    for week, games in tqdm(season_games.items()):
-        for matchup in tqdm(games):
-            name = matchup[0] + "v" + matchup[1]
-            home_results, away_results = sim.parallel_sim(matchup[0], matchup[1],n,
-                                                        cpus)
-            results[week][name] = (np.mean(home_results),np.mean(away_results))
-            reformed_stats = {(stat, player): values 
-                            for stat, players in sim.sim_stats.items() 
-                            for player, values in players.items()}
-            i = max(len(value) for value in reformed_stats.values())
-            fill = [0] * i
-            padded_stats = {player:stats[:n] + fill[len(stats):] 
-                            for player, stats in reformed_stats.items()}
-            for key, game_stats in padded_stats.items():
-                stat, player = key[0], key[1]
-                stats[player][stat].append(np.mean(game_stats))
+    games = [(week, matchup) for week, matchups in season_games.items() for matchup in matchups]
+    summaries = dict(tqdm(sim.iter_matchups([matchup for _, matchup in games], n, cpus, engine,
+                                                  seed=seed, cache=cache),
+                          total=len(games)))
+    # Assemble in schedule order, whatever order the matchups finished in
+    for i, (week, matchup) in enumerate(games):
+        summary = summaries[i]
+        name = matchup[0] + "v" + matchup[1]
+        results[week][name] = summary.score_mean()
+        for player in summary.players:
+            for stat in summary.stat_names:
+                if summary.has_data(stat, player):
+                    stats[player][stat].append(summary.mean(stat, player))
 
     with open("./results/season_scores_MK1.json", "w") as f:
         json.dump(results, f)
@@ -112,18 +119,17 @@ def sim_season(sim:Monte_Carlo_Sim, season_games:dict, n:int, cpus:int, save_sta
             json.dump(stats, f)
 
 def calculate_fantasy_points(stats_file="./results/season_stats_MK1.json", 
-                             ppr=True) -> dict[str, float]:
-    player_fpts = dict()
-    stat_points = {"pass_yards":0.04,"pass_tds":4,"ints":-2,"rush_yards":0.1,
-                   "rush_tds":6,"rec":1,"rec_yards":0.1,"rec_tds":6}
+                             ppr=True, rules=None) -> dict[str, float]:
+    # Season fantasy points from the per-matchup mean stats written by sim_season().
+    # rules is a fantasy.SCORING name or {stat: points} dict, overriding ppr.
+    # Full per-player distributions come from fantasy.sim_slate()/season_points()
+    rules = rules if rules is not None else ("ppr" if ppr else "standard")
     player_stats = json.load(open(stats_file, "r"))
-    for player, stats in player_stats.items():
-        player_fpts[player] = 0
-        for stat_name, points in stat_points.items():
-            player_fpts[player] += points * np.sum(stats.get(stat_name,[0]))
-    return player_fpts
+    totals = np.array([[np.sum(stats.get(stat, [0])) for stat in STAT_NAMES]
+                       for stats in player_stats.values()]).reshape(-1, len(STAT_NAMES))
+    return dict(zip(player_stats, fantasy_points(totals, rules).tolist()))
 
 if __name__ == "__main__":
    freeze_support()
-   sim_season(sim, season, n, cpus)
+   sim_season(sim, season, n, cpus, seed=seed, cache=ResultCache())
    print(calculate_fantasy_points())
\ No newline at end of file
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import numpy as np
+from results_store import ResultsStore, save_results
+
+class ResultCache:
+    """On-disk cache of seeded simulation results.
+
+    A seeded run is reproducible (see monte_carlo.SEED_BLOCKS), so the games
+    of a (home, away, results hash, seed, engine) run only ever need to be
+    simulated once. Each entry is a results store (see results_store) holding
+    the first n games of one such run, so a request for more games only
+    simulates the missing ones. A request for fewer reads a prefix with the
+    game engine. The vectorized engines draw over a whole random stream block
+    at once, so a game depends on the length of its block. They reuse only
+    whole blocks and simulate the trailing partial block.
+
+    The results hash (Monte_Carlo_Sim.results_hash) covers the model, its
+    pool_size and the engines' version, which all change seeded games.
+
+    Entries are evicted least recently used first once the cache grows past
+    max_bytes.
+
+    Typical usage example:
+
+        cache = ResultCache("./cache")
+        home_scores, away_scores = sim.parallel_sim("PHI","DAL",20000,4,seed=0,cache=cache)
+
+    Attributes:
+        path: Cache directory
+        max_bytes: Size limit of all entries combined
+    """
+
+    def __init__(self, path:str="./cache", max_bytes:int=2*1024**3):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(home:str, away:str, results_hash:str, seed:int, engine:str) -> str:
+        return hashlib.sha256(json.dumps([home, away, results_hash, seed, engine]).encode()).hexdigest()[:32]
+
+    def get(self, home:str, away:str, results_hash:str, seed:int,
+            engine:str) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+        """Cached games of a seeded run.
+
+        Returns:
+            Home scores, away scores and a (games, players, stats) stat array
+            as returned by Monte_Carlo_Sim.simulate(), or None if the run is
+            not cached.
+        """
+        entry = os.path.join(self.path, self.key(home, away, results_hash, seed, engine))
+        try:
+            store = ResultsStore(entry)
+            home_scores, away_scores = store.scores()
+            results = (np.array(home_scores), np.array(away_scores), store.games())
+        except (OSError, ValueError, KeyError):
+            # Missing, partially evicted or unreadable entry
+            return None
+        # Mark as recently used
+        os.utime(os.path.join(entry, "key.json"))
+        return results
+
+    def put(self, home:str, away:str, results_hash:str, seed:int, engine:str, players:list[str],
+            stat_names:list[str], home_scores:np.ndarray, away_scores:np.ndarray, stats:np.ndarray):
+        # Store (or replace) the first len(home_scores) games of a seeded run
+        key = self.key(home, away, results_hash, seed, engine)
+        entry = os.path.join(self.path, key)
+        # Build the entry next to its final location and swap it in
+        tmp_entry = "{}.{}.{}.tmp".format(entry, os.getpid(), threading.get_ident())
+        save_results(tmp_entry, players, stat_names, stats, home_scores, away_scores)
+        with open(os.path.join(tmp_entry, "key.json"), "w") as f:
+            json.dump({"home":home, "away":away, "results_hash":results_hash, "seed":seed,
+                       "engine":engine, "n":len(home_scores)}, f)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+        self.evict(keep=key)
+
+    def entries(self) -> list[tuple[str, float, int]]:
+        # (key, last used time, size in bytes) of every complete entry
+        entries = []
+        for key in os.listdir(self.path):
+            if key.endswith(".tmp"):
+                # Being written by another process
+                continue
+            entry = os.path.join(self.path, key)
+            try:
+                last_used = os.path.getmtime(os.path.join(entry, "key.json"))
+                size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+            except OSError:
+                continue
+            entries.append((key, last_used, size))
+        return entries
+
+    def evict(self, keep:str|None=None):
+        # Remove least recently used entries until the cache fits in max_bytes
+        entries = sorted(self.entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.path, key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for key, _, _ in self.entries():
+            shutil.rmtree(os.path.join(self.path, key), ignore_errors=True)
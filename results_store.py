@@ -0,0 +1,101 @@
+import json
+import os
+import numpy as np
+
+# Bump whenever the on-disk layout changes
+STORE_VERSION = 1
+
+def save_results(path:str, players:list[str], stat_names:list[str], stats:np.ndarray,
+                 home_scores:np.ndarray|None=None, away_scores:np.ndarray|None=None):
+    """Write simulated player stats (and optionally scores) as a columnar store.
+
+    A store is a directory holding:
+        index.json: players, stats, number of games, and per-column means and
+            whether each column has any non-zero value
+        stats.npy: float32 array indexed [stat, player, game], so each
+            (stat, player) column is contiguous on disk
+        scores.npy: int16 array indexed [home/away, game] (if scores are given)
+
+    Args:
+        path: Store directory (created if missing)
+        players: Player names along the player axis of stats
+        stat_names: Stat names along the stat axis of stats
+        stats: (games, players, stats) array of per-game stats
+        home_scores: (games,) array of home scores
+        away_scores: (games,) array of away scores
+    """
+    os.makedirs(path, exist_ok=True)
+    n = stats.shape[0]
+    # One strided pass into [stat, player, game] order, everything after is contiguous
+    columns = np.empty((len(stat_names), len(players), n), dtype=np.float32)
+    columns[...] = np.moveaxis(stats, 0, -1).transpose(1, 0, 2)
+    np.save(os.path.join(path, "stats.npy"), columns)
+    if home_scores is not None:
+        np.save(os.path.join(path, "scores.npy"), np.stack([home_scores, away_scores]).astype(np.int16))
+    index = {"version":STORE_VERSION, "players":list(players), "stats":list(stat_names), "n":n,
+             "means":columns.mean(axis=2, dtype=float).tolist() if n else [[0]*len(players)]*len(stat_names),
+             "has_data":columns.any(axis=2).tolist()}
+    with open(os.path.join(path, "index.json"), "w") as f:
+        json.dump(index, f)
+
+def list_results(dir_path:str="./results") -> list[str]:
+    # Names of every store in dir_path (e.g. "PHIvDAL")
+    if not os.path.isdir(dir_path):
+        return []
+    return sorted(name for name in os.listdir(dir_path)
+                  if os.path.isfile(os.path.join(dir_path, name, "index.json")))
+
+class ResultsStore:
+    """Read-only, memory-mapped view of a store written by save_results().
+
+    Opening a store only reads its small index. Columns are memory-mapped, so
+    reading one (stat, player) column touches only that column's bytes.
+
+    Typical usage example:
+
+        store = ResultsStore("./results/PHIvDAL")
+        pass_yards = store.column("pass_yards", "Jalen Hurts")
+    """
+
+    def __init__(self, path:str):
+        self.path = path
+        with open(os.path.join(path, "index.json"), "r") as f:
+            index = json.load(f)
+        if index["version"] != STORE_VERSION:
+            raise ValueError("Unsupported results store version: {}".format(index["version"]))
+        self.players = index["players"]
+        self.stat_names = index["stats"]
+        self.n = index["n"]
+        self._means = index["means"]
+        self._has_data = index["has_data"]
+        self._stats = None
+
+    def __index(self, stat:str, player:str) -> tuple[int, int]:
+        return self.stat_names.index(stat), self.players.index(player)
+
+    def column(self, stat:str, player:str) -> np.ndarray:
+        # Per-game values of one stat for one player
+        if self._stats is None:
+            self._stats = np.load(os.path.join(self.path, "stats.npy"), mmap_mode="r")
+        s, p = self.__index(stat, player)
+        return self._stats[s, p]
+
+    def games(self) -> np.ndarray:
+        # Every stat as a (games, players, stats) array, the layout save_results() takes
+        return np.load(os.path.join(self.path, "stats.npy")).transpose(2, 1, 0)
+
+    def mean(self, stat:str, player:str) -> float:
+        # Mean per game (0 for players not in the store)
+        if player not in self.players:
+            return 0
+        s, p = self.__index(stat, player)
+        return self._means[s][p]
+
+    def players_with(self, stat:str) -> list[str]:
+        # Players that recorded a non-zero value of stat in at least one game
+        s = self.stat_names.index(stat)
+        return [player for player, has_data in zip(self.players, self._has_data[s]) if has_data]
+
+    def scores(self) -> tuple[np.ndarray, np.ndarray]:
+        scores = np.load(os.path.join(self.path, "scores.npy"), mmap_mode="r")
+        return scores[0], scores[1]
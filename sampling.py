@@ -0,0 +1,198 @@
+import numpy as np
+
+class VariatePool:
+    """Buffer of pre-drawn random variates from a single frozen distribution.
+
+    Drawing one value at a time through scipy's rvs() pays its argument
+    checking overhead on every call. A VariatePool draws a block of values in
+    one call and hands them out one by one, refilling lazily when the buffer
+    runs out. Blocks start small and double on every refill up to max_size, so
+    rarely used distributions stay cheap while busy ones amortize the cost of
+    each rvs() call over up to max_size values.
+
+    Typical usage example:
+
+        pool = VariatePool(st.norm(45, 5), max_size=4096)
+        punt_yards = pool.draw()
+
+    Attributes:
+        dist: Frozen distribution (anything with an rvs(size, random_state) method)
+        max_size: Upper bound on the number of buffered values (memory per pool
+            is 8*max_size bytes)
+        rng: numpy Generator used for refills
+    """
+
+    def __init__(self, dist, max_size:int=4096, rng:np.random.Generator|None=None,
+                 min_size:int=64):
+        if max_size < 1:
+            raise ValueError("max_size must be 1+, not {0:n}".format(max_size))
+        self.dist = dist
+        self.max_size = max_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.min_size = min(min_size, max_size)
+        self._block = self.min_size
+        self._buffer = np.empty(0)
+        self._pos = 0
+
+    def __refill(self):
+        self._buffer = self.dist.rvs(size=self._block, random_state=self.rng)
+        self._pos = 0
+        self._block = min(2*self._block, self.max_size)
+
+    def draw(self) -> float:
+        if self._pos >= len(self._buffer):
+            self.__refill()
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return value
+
+    def reseed(self, rng:np.random.Generator):
+        # Discard buffered values and restart the block schedule, so the values
+        # drawn after a reseed depend only on the new stream
+        self.rng = rng
+        self._block = self.min_size
+        self._buffer = np.empty(0)
+        self._pos = 0
+
+def stream_rng(seed:int, index:int) -> np.random.Generator:
+    # Generator for child index of SeedSequence(seed).spawn(), without spawning
+    # every child before it
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+def build_alias(probs:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Build Walker alias tables for categorical distributions.
+
+    Each row along the last axis of probs is one categorical distribution. Rows
+    are normalized before building, and all-zero rows (unused table cells) are
+    treated as uniform.
+
+    Args:
+        probs: Array of category probabilities, shape (..., k)
+
+    Returns:
+        Two arrays of shape (..., k), the acceptance probabilities and the
+        alias categories, for use with alias_draw()/alias_sample().
+    """
+    probs = np.asarray(probs, dtype=float)
+    k = probs.shape[-1]
+    rows = probs.reshape(-1, k)
+    prob = np.ones_like(rows)
+    alias = np.tile(np.arange(k), (len(rows), 1))
+    for r, row in enumerate(rows):
+        total = row.sum()
+        scaled = row * k / total if total > 0 else np.ones(k)
+        small = [i for i in range(k) if scaled[i] < 1]
+        large = [i for i in range(k) if scaled[i] >= 1]
+        # Vose's method: pair each underfull category with an overfull one
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[r, s], alias[r, s] = scaled[s], l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+        # Leftovers are 1 up to rounding error
+        for i in small + large:
+            prob[r, i] = 1
+    return prob.reshape(probs.shape), alias.reshape(probs.shape)
+
+def alias_draw(prob:np.ndarray, alias:np.ndarray, u:float) -> int:
+    # O(1) categorical draw from one alias row, using a single uniform u in [0, 1)
+    k = len(prob)
+    scaled = u * k
+    i = min(int(scaled), k-1)
+    return i if scaled - i < prob[i] else alias[i]
+
+def alias_sample(prob:np.ndarray, alias:np.ndarray, u:np.ndarray) -> np.ndarray:
+    # Vectorized alias_draw(), one (k,) row of prob/alias per uniform in u
+    k = prob.shape[-1]
+    prob = np.broadcast_to(prob, u.shape + (k,))
+    alias = np.broadcast_to(alias, u.shape + (k,))
+    scaled = u * k
+    i = np.minimum(scaled.astype(int), k-1)
+    accept = (scaled - i) < np.take_along_axis(prob, i[..., None], -1)[..., 0]
+    return np.where(accept, i, np.take_along_axis(alias, i[..., None], -1)[..., 0])
+
+class QuantileTable:
+    """Inverse CDF of a continuous distribution tabulated on a uniform grid.
+
+    The quantile function is stored as float32 values at u = 0, 1/k, ..., 1 and
+    linearly interpolated in between, so sampling is one uniform draw, an
+    index and a multiply-add, with no scipy calls. The two end cells cover
+    the (possibly unbounded) tails, and their outer values are set so each end
+    cell keeps the distribution's conditional tail mean.
+
+    Tables have the same rvs(size, random_state) interface as frozen scipy
+    distributions, so they can be used wherever those are sampled (including
+    VariatePool).
+
+    Typical usage example:
+
+        table = QuantileTable.from_dist(st.genextreme(-0.2, 3, 6))
+        yards = table.rvs(size=1000, random_state=rng)
+        table.validate(st.genextreme(-0.2, 3, 6))
+
+    Attributes:
+        values: float32 quantiles at the k+1 grid points
+    """
+
+    def __init__(self, values:np.ndarray):
+        self.values = np.asarray(values, dtype=np.float32)
+        self._cells = len(self.values) - 1
+        self._steps = np.diff(self.values)
+
+    @classmethod
+    def from_dist(cls, dist, cells:int=2048, tail_points:int=256) -> "QuantileTable":
+        """Tabulate a frozen scipy distribution.
+
+        Args:
+            dist: Frozen continuous scipy.stats distribution
+            cells: Number of grid cells k (memory is 4*(k+1) bytes)
+            tail_points: ppf evaluations used to integrate each tail cell's mean
+        """
+        u = np.linspace(0, 1, cells+1)
+        values = dist.ppf(u)
+        # Geometric grid of distances from the outer edge of an end cell
+        edge = np.geomspace(1e-12, 1/cells, tail_points)
+        for end, inner, tail_u, tail_prob in ((0, 1, edge, dist.cdf), (-1, -2, 1 - edge, dist.sf)):
+            tail = dist.ppf(tail_u)
+            # Far tail quantiles can fail to converge, keep the ones whose
+            # probability round-trips (the mass beyond them is negligible)
+            with np.errstate(invalid="ignore"):
+                valid = np.isfinite(tail) & np.isclose(tail_prob(tail), edge, rtol=0.1, atol=0)
+            valid[-1] = True
+            tail_mean = np.trapezoid(tail[valid], edge[valid]) / (edge[-1] - edge[valid][0])
+            values[end] = 2*tail_mean - values[inner]
+        return cls(values)
+
+    def ppf(self, u:np.ndarray) -> np.ndarray:
+        scaled = np.asarray(u) * self._cells
+        i = np.minimum(scaled.astype(np.intp), self._cells-1)
+        return self.values[i] + (scaled - i) * self._steps[i]
+
+    def rvs(self, size=None, random_state:np.random.Generator|None=None) -> np.ndarray:
+        rng = random_state if random_state is not None else np.random.default_rng()
+        return self.ppf(rng.random(size))
+
+    def mean(self) -> float:
+        # Exact mean of the piecewise linear quantile function
+        return float(np.mean((self.values[:-1].astype(float) + self.values[1:]) / 2))
+
+    def std(self) -> float:
+        a, b = self.values[:-1].astype(float), self.values[1:].astype(float)
+        return float(np.sqrt(np.mean((a*a + a*b + b*b) / 3) - self.mean()**2))
+
+    def validate(self, dist) -> dict[str, float]:
+        """Accuracy of the table against the distribution it was built from.
+
+        Returns:
+            ks: Largest difference between the table's CDF and dist's CDF, at
+                the grid points and cell midpoints
+            mean_error, std_error: Relative errors of the table's mean and
+                standard deviation (tables are bounded, so std_error is large
+                for tails close to infinite variance)
+        """
+        u = np.linspace(0, 1, self._cells+1)
+        values = self.values.astype(float)
+        mid_u, mid_values = (u[:-1] + u[1:]) / 2, (values[:-1] + values[1:]) / 2
+        ks = max(np.abs(dist.cdf(values[1:-1]) - u[1:-1]).max(), np.abs(dist.cdf(mid_values) - mid_u).max())
+        return {"ks":float(ks), "mean_error":abs(self.mean()/dist.mean() - 1),
+                "std_error":abs(self.std()/dist.std() - 1)}
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from multiprocessing import freeze_support
+from monte_carlo import Monte_Carlo_Sim
+from fantasy import scoring_weights
+
+# Per-game score metrics compared between scenarios
+SCORE_METRICS = ("home_score", "away_score", "spread", "total", "home_win")
+
+def scenario_games(sim:Monte_Carlo_Sim, home:str, away:str, n:int, cpu_count:int, seed:int,
+                   rules:str|dict[str, float]="ppr", batch_size:int|None=None,
+                   cache=None) -> tuple[np.ndarray, list[str], np.ndarray]:
+    """Per-game score metrics and fantasy points of one scenario.
+
+    Games are simulated with common random numbers (engine="common"), so game
+    i of two scenarios run with the same seed shares its random draws.
+
+    Returns:
+        (n, SCORE_METRICS) array, the matchup's players and their (n, players)
+        fantasy points.
+    """
+    weights = scoring_weights(rules)
+    metrics, points = list(), list()
+    for home_scores, away_scores, stats in sim.iter_sim(home, away, n, cpu_count, engine="common",
+                                                         batch_size=batch_size, seed=seed, cache=cache):
+        # Ties count as half a win
+        metrics.append(np.stack([home_scores, away_scores, home_scores - away_scores, home_scores + away_scores,
+                                 (np.sign(home_scores - away_scores) + 1) / 2], axis=1))
+        points.append(stats.astype(float) @ weights)
+    return np.concatenate(metrics).astype(float), sim.matchup_players(home, away), np.concatenate(points)
+
+def compare_scenarios(sim:Monte_Carlo_Sim, changes:dict[str, dict[str, str]], home:str, away:str,
+                      n:int, cpu_count:int, seed:int|None=None, rules:str|dict[str, float]="ppr",
+                      batch_size:int|None=None, cache=None) -> pd.DataFrame:
+    """What-if comparison of a roster or coaching change against the baseline.
+
+    The baseline (sim) and the variant (sim.variant(changes)) simulate the
+    same n games with common random numbers: game i of both uses the same
+    random draws, snap by snap (see Monte_Carlo_Sim.sim_batch()). Their per-game
+    results are positively correlated, so the standard error of the paired
+    difference is well below that of two independent runs and the same
+    precision takes a fraction of the games. The efficiency column reports
+    how many times more games two independent runs would need.
+
+    Typical usage example:
+
+        compare_scenarios(sim, {"PHI":{"qb":"Tanner McKee"}}, "PHI", "DAL", 10000, 8)
+        compare_scenarios(sim, {"DAL":{"coach":"Andy Reid"}}, "PHI", "DAL", 10000, 8)
+
+    Args:
+        sim: Monte Carlo Sim object of the baseline
+        changes: Roster and coach changes of the variant, see
+            Monte_Carlo_Sim.variant()
+        home: String team name abbreviation for home team
+        away: String team name abbreviation for away team
+        n: Integer number of games per scenario
+        cpu_count: Integer number of cores, each scenario runs on its own pool
+        seed: Integer seed shared by both scenarios (default a random one)
+        rules: Fantasy scoring rules, see fantasy.scoring_weights()
+        batch_size: Integer number of games per task
+        cache: ResultCache for the scenarios' games (the baseline's games are
+            reused when comparing several variants with one seed)
+
+    Returns:
+        DataFrame indexed by metric (SCORE_METRICS, then "points: <player>" for
+        every player on both scenarios' rosters) with the baseline and variant
+        means, their difference, its standard error (se), the standard error
+        two independent runs would have (independent_se) and efficiency.
+    """
+    seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2**63)
+    variant = sim.variant(changes)
+    try:
+        base_metrics, base_players, base_points = scenario_games(sim, home, away, n, cpu_count, seed,
+                                                                 rules, batch_size, cache)
+        variant_metrics, variant_players, variant_points = scenario_games(variant, home, away, n, cpu_count,
+                                                                          seed, rules, batch_size, cache)
+    finally:
+        variant.close()
+    players = [player for player in base_players if player in variant_players]
+    base = np.hstack([base_metrics, base_points[:, [base_players.index(player) for player in players]]])
+    other = np.hstack([variant_metrics, variant_points[:, [variant_players.index(player) for player in players]]])
+    difference = other - base
+    se = difference.std(axis=0, ddof=1) / np.sqrt(n)
+    independent_se = np.sqrt((base.var(axis=0, ddof=1) + other.var(axis=0, ddof=1)) / n)
+    return pd.DataFrame({"baseline":base.mean(axis=0), "variant":other.mean(axis=0),
+                         "difference":difference.mean(axis=0), "se":se, "independent_se":independent_se,
+                         "efficiency":np.divide(independent_se**2, se**2, out=np.full(len(se), np.inf),
+                                                where=se > 0)},
+                        index=pd.Index(list(SCORE_METRICS) + ["points: {}".format(player) for player in players],
+                                       name="metric"))
+
+if __name__ == "__main__":
+    freeze_support()
+    from projections import sim, seed
+    print(compare_scenarios(sim, {"PHI":{"qb":"Tanner McKee"}}, "PHI", "DAL", 10000, 10, seed).round(3))
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from multiprocessing import freeze_support
+from tqdm import tqdm
+from monte_carlo import Monte_Carlo_Sim
+from aggregation import SCORE_RANGE
+from result_cache import ResultCache
+
+DIVISIONS = {"AFC East":["BUF","MIA","NE","NYJ"], "AFC North":["BAL","CIN","CLE","PIT"],
+             "AFC South":["HOU","IND","JAX","TEN"], "AFC West":["DEN","KC","LAC","LV"],
+             "NFC East":["DAL","NYG","PHI","WAS"], "NFC North":["CHI","DET","GB","MIN"],
+             "NFC South":["ATL","CAR","NO","TB"], "NFC West":["ARI","LAR","SEA","SF"]}
+# Playoff teams per conference: division winners are seeded first, then wild cards
+WILD_CARDS = 3
+# Seasons sampled at once, bounds memory at about 10 MB per 1,000 seasons
+SEASON_CHUNK = 10000
+
+def score_distributions(sim:Monte_Carlo_Sim, matchups:list[tuple[str, str]], n:int, cpu_count:int,
+                        engine="game", seed:int|None=None, cache:ResultCache|None=None,
+                        progress=True) -> dict[tuple[str, str], np.ndarray]:
+    """Joint (home, away) final score distribution of every matchup.
+
+    Matchups whose seeded games are in the cache are read from it. The rest
+    fall back to play-by-play simulation on the sim's worker pool (see
+    Monte_Carlo_Sim.iter_matchups()) and are added to the cache for next time.
+
+    Returns:
+        Dictionary of (home, away): probabilities indexed [home score, away score]
+    """
+    matchups = list(dict.fromkeys(matchups))
+    summaries = sim.iter_matchups(matchups, n, cpu_count, engine, seed=seed, cache=cache)
+    if progress:
+        summaries = tqdm(summaries, total=len(matchups))
+    return {matchups[i]:summary.score_histogram() / summary.n for i, summary in summaries}
+
+def sample_seasons(distributions:dict[tuple[str, str], np.ndarray], games:list[tuple[str, str]],
+                   n_seasons:int, divisions:dict[str, list[str]]=DIVISIONS, rng=None,
+                   chunk_size:int=SEASON_CHUNK) -> pd.DataFrame:
+    """Standings and playoff odds over n_seasons sampled seasons.
+
+    Every game of every season draws its final score from its matchup's
+    joint score distribution, so a season costs a few array operations per
+    game instead of a play-by-play simulation. Ties (equal final scores)
+    count as half a win.
+
+    Ties in the standings are broken by division record (division titles) or
+    conference record (seeding), then point differential, then at random.
+    This stands in for the NFL's head-to-head and common games steps, which
+    do not vectorize across seasons.
+
+    Args:
+        distributions: Joint score distribution of every matchup in games, as
+            returned by score_distributions()
+        games: Every (home, away) game of the season
+        n_seasons: Number of seasons to sample
+        divisions: Teams of each division, keyed "<conference> <division>"
+        rng: numpy Generator (default unseeded)
+        chunk_size: Seasons sampled at once
+
+    Returns:
+        DataFrame indexed by team with conference, division, mean wins, losses,
+        ties and point differential, the probability of each of the wins
+        (wins_0 ... wins_17), a division title, a playoff spot and each playoff
+        seed (seed_1 ... seed_7).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    teams = [team for members in divisions.values() for team in members]
+    codes = {team:i for i, team in enumerate(teams)}
+    division_of = np.array([d for d, members in enumerate(divisions.values()) for _ in members])
+    division_conferences = [name.split(" ")[0] for name in divisions]
+    conferences = list(dict.fromkeys(division_conferences))
+    conference_of = np.array([conferences.index(division_conferences[d]) for d in division_of])
+    home = np.array([codes[game[0]] for game in games])
+    away = np.array([codes[game[1]] for game in games])
+    # (games, teams) indicators of the home and away side of every game
+    home_side = np.zeros((len(games), len(teams)))
+    home_side[np.arange(len(games)), home] = 1
+    away_side = np.zeros((len(games), len(teams)))
+    away_side[np.arange(len(games)), away] = 1
+    division_game = division_of[home] == division_of[away]
+    conference_game = conference_of[home] == conference_of[away]
+    size = SCORE_RANGE[1]-SCORE_RANGE[0]
+    cdfs = {matchup:np.cumsum(dist.ravel()) for matchup, dist in distributions.items()}
+    max_games = int(max(home_side.sum(axis=0) + away_side.sum(axis=0)))
+    n_seeds = max(division_conferences.count(conference) for conference in conferences) + WILD_CARDS
+
+    totals = {"wins":np.zeros(len(teams)), "losses":np.zeros(len(teams)), "ties":np.zeros(len(teams)),
+              "point_diff":np.zeros(len(teams)), "division_title":np.zeros(len(teams)),
+              "playoffs":np.zeros(len(teams))}
+    win_counts = np.zeros((len(teams), max_games+1))
+    seed_counts = np.zeros((len(teams), n_seeds))
+    for first in range(0, n_seasons, chunk_size):
+        seasons = min(chunk_size, n_seasons - first)
+        scores = np.empty((seasons, len(games)), dtype=np.int64)
+        for g, game in enumerate(games):
+            cdf = cdfs[game]
+            scores[:, g] = np.minimum(np.searchsorted(cdf, rng.random(seasons)*cdf[-1], side="right"), cdf.size-1)
+        home_scores, away_scores = scores // size + SCORE_RANGE[0], scores % size + SCORE_RANGE[0]
+        home_win = (home_scores > away_scores).astype(float)
+        away_win = (home_scores < away_scores).astype(float)
+        tie = 1 - home_win - away_win
+        wins = home_win @ home_side + away_win @ away_side
+        ties = tie @ (home_side + away_side)
+        losses = away_win @ home_side + home_win @ away_side
+        margin = (home_scores - away_scores).astype(float)
+        point_diff = margin @ home_side - margin @ away_side
+        # Doubled wins plus ties, so every record is an integer
+        record = 2*wins + ties
+        division_record = (2*home_win + tie)[:, division_game] @ home_side[division_game] \
+                          + (2*away_win + tie)[:, division_game] @ away_side[division_game]
+        conference_record = (2*home_win + tie)[:, conference_game] @ home_side[conference_game] \
+                            + (2*away_win + tie)[:, conference_game] @ away_side[conference_game]
+        # Lexicographic ranking keys: record, then tiebreak record, point differential and a random draw
+        tiebreak = np.clip(point_diff, -4999, 4999) + 5000 + rng.random(point_diff.shape)
+        division_key = (record*100 + division_record)*1e4 + tiebreak
+        conference_key = (record*100 + conference_record)*1e4 + tiebreak
+
+        winners = np.zeros((seasons, len(teams)), dtype=bool)
+        for d in range(len(divisions)):
+            members = np.flatnonzero(division_of == d)
+            winners[np.arange(seasons), members[np.argmax(division_key[:, members], axis=1)]] = True
+        seeds = np.zeros((seasons, len(teams)), dtype=int)
+        for c in range(len(conferences)):
+            members = np.flatnonzero(conference_of == c)
+            n_winners = int(winners[0, members].sum())
+            # Division winners first, then the best remaining records
+            key = conference_key[:, members] + np.where(winners[:, members], 1e9, 0)
+            order = np.argsort(-key, axis=1)[:, :n_winners + WILD_CARDS]
+            for s in range(order.shape[1]):
+                seeds[np.arange(seasons), members[order[:, s]]] = s+1
+        totals["wins"] += wins.sum(axis=0)
+        totals["losses"] += losses.sum(axis=0)
+        totals["ties"] += ties.sum(axis=0)
+        totals["point_diff"] += point_diff.sum(axis=0)
+        totals["division_title"] += winners.sum(axis=0)
+        totals["playoffs"] += (seeds > 0).sum(axis=0)
+        for t in range(len(teams)):
+            win_counts[t] += np.bincount(np.floor(wins[:, t]).astype(int), minlength=max_games+1)
+            seed_counts[t] += np.bincount(seeds[:, t], minlength=n_seeds+1)[1:]
+
+    odds = pd.DataFrame(index=pd.Index(teams, name="team"))
+    odds["conference"] = [conferences[c] for c in conference_of]
+    odds["division"] = [list(divisions)[d] for d in division_of]
+    for name, total in totals.items():
+        odds[name] = total / n_seasons
+    for wins in range(max_games+1):
+        odds["wins_{}".format(wins)] = win_counts[:, wins] / n_seasons
+    for s in range(n_seeds):
+        odds["seed_{}".format(s+1)] = seed_counts[:, s] / n_seasons
+    return odds.sort_values(["conference", "division", "wins"], ascending=[True, True, False])
+
+def sim_seasons(sim:Monte_Carlo_Sim, season_games:dict, n_seasons:int, n:int, cpu_count:int,
+                divisions:dict[str, list[str]]=DIVISIONS, engine="game", seed:int|None=None,
+                cache:ResultCache|None=None) -> pd.DataFrame:
+    """Simulate n_seasons seasons from n simulated games per matchup.
+
+    Inputs:
+        sim: Monte Carlo Sim object
+        season_games: A dictionary containing the season's matchups
+            keys = weeks (int), values = list of (home, away) tuples
+        n_seasons: Number of seasons to sample (100,000+ takes seconds)
+        n: Number of games simulated per matchup to build its score distribution
+        cpu_count: Number of cpus to use for matchups missing from the cache
+        divisions: Teams of each division
+        engine: "game" (sim_game) or "batch" (sim_batch)
+        seed: Seed for reproducible matchups and seasons (int)
+        cache: ResultCache the score distributions are read from and added to
+    """
+    games = [matchup for matchups in season_games.values() for matchup in matchups]
+    distributions = score_distributions(sim, games, n, cpu_count, engine, seed, cache)
+    return sample_seasons(distributions, games, n_seasons, divisions, np.random.default_rng(seed))
+
+if __name__ == "__main__":
+    freeze_support()
+    from projections import season, sim, seed
+    odds = sim_seasons(sim, season, 100000, 1000, 10, engine="batch", seed=seed, cache=ResultCache())
+    odds.to_csv("./results/season_odds.csv")
+    print(odds[["wins", "losses", "ties", "division_title", "playoffs", "seed_1"]].round(3))